@@ -0,0 +1,348 @@
+import sys
+import os
+import json
+import time
+import queue
+import shutil
+import argparse
+import statistics
+import subprocess
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.runner import get_runner, CREATION_FLAGS
+from core.tester import StressTester
+from core.calibration import percentile
+from core.async_engine import AsyncStressTester
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Trivial programs that copy stdin to stdout, so that almost all of the measured
+# time is spent in the harness and in process startup.
+ECHO_PROGRAMS = {
+    'python': """import sys
+sys.stdout.write(sys.stdin.read())
+""",
+    'cpp': """#include <iostream>
+
+int main() {
+    std::ios::sync_with_stdio(false);
+    std::cout << std::cin.rdbuf();
+    return 0;
+}
+""",
+    'java': """public class Main {
+    public static void main(String[] args) throws Exception {
+        System.in.transferTo(System.out);
+        System.out.flush();
+    }
+}
+""",
+}
+
+# Generators used for the full-loop benchmark. They print a single short line.
+ECHO_GENERATORS = {
+    'python': 'print(1)\n',
+    'cpp': """#include <iostream>
+
+int main() {
+    std::cout << 1 << std::endl;
+    return 0;
+}
+""",
+    'java': """public class Main {
+    public static void main(String[] args) {
+        System.out.println(1);
+    }
+}
+""",
+}
+
+TOOLCHAINS = {
+    'python': ["python"],
+    'cpp': ["g++"],
+    'java': ["javac", "java"],
+}
+
+
+def available_languages():
+    """Returns the languages whose toolchain is installed on this machine."""
+    return [lang for lang, tools in TOOLCHAINS.items() if all(shutil.which(tool) for tool in tools)]
+
+
+def make_input(size):
+    """Builds an input of roughly `size` bytes made of short numeric lines."""
+    line = "1234567\n"
+    return line * max(1, size // len(line))
+
+
+def _raw_run(argv, payload):
+    process = subprocess.Popen(
+        argv,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        creationflags=CREATION_FLAGS
+    )
+    process.communicate(payload)
+
+
+def _timed_parallel(func, concurrency, repeat):
+    """Calls `func` `repeat` times on each of `concurrency` threads.
+
+    Returns the per-call latencies and the total wall time.
+    """
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def _timed_pairs(first, second, concurrency, repeat):
+    """Times `first` and `second` back to back, `repeat` times on each of `concurrency` threads.
+
+    Returns a list of (first, second) latencies. The order within a pair
+    alternates, so that neither function always runs on a warmer machine.
+    """
+    pairs = []
+    lock = threading.Lock()
+
+    def timed(func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def worker():
+        local = []
+        for i in range(repeat):
+            if i % 2:
+                b = timed(second)
+                a = timed(first)
+            else:
+                a = timed(first)
+                b = timed(second)
+            local.append((a, b))
+        with lock:
+            pairs.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return pairs
+
+
+def _spread(values):
+    """Returns the interquartile range of `values`."""
+    return percentile(values, 0.75) - percentile(values, 0.25)
+
+
+def bench_runner(language, size, concurrency, repeat):
+    """Measures `Runner.run` against a raw `Popen` of the same command.
+
+    The raw run only spawns the process and moves bytes through the pipes, so the
+    difference between the two is the overhead added by the runner itself
+    (process group setup, text encoding and decoding, `communicate` bookkeeping,
+    killing leftovers). Raw and runner calls are interleaved and the overhead is
+    the median of the paired differences; `overhead_noise_ms` is their spread.
+    The one-off costs of a runner are measured directly: `setup_ms` (its
+    temporary directory) and `compile_ms` (writing the source and compiling).
+    """
+    start = time.perf_counter()
+    runner = get_runner(language, ECHO_PROGRAMS[language], timeout=30)
+    setup_time = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        success, msg = runner.compile()
+        compile_time = time.perf_counter() - start
+        if not success:
+            raise RuntimeError(f"Compilation failed for {language}:\n{msg}")
+
+        input_str = make_input(size)
+        payload = input_str.encode()
+        argv = runner.command()
+
+        # Warm up caches (interpreter bytecode, page cache, JIT class data).
+        runner.run(input_str)
+
+        pairs = _timed_pairs(lambda: _raw_run(argv, payload), lambda: runner.run(input_str), concurrency, repeat)
+    finally:
+        runner.cleanup()
+
+    harness = [run for _, run in pairs]
+    differences = [run - raw for raw, run in pairs]
+    harness_median = statistics.median(harness)
+    return {
+        'setup_ms': setup_time * 1000,
+        'compile_ms': compile_time * 1000,
+        'raw_ms': statistics.median(raw for raw, _ in pairs) * 1000,
+        'run_ms': harness_median * 1000,
+        'run_p95_ms': percentile(harness, 0.95) * 1000,
+        'overhead_ms': statistics.median(differences) * 1000,
+        'overhead_noise_ms': _spread(differences) * 1000,
+        # Every thread runs the program back to back.
+        'throughput': concurrency / harness_median,
+    }
+
+
+def bench_threads(count, repeat=1000):
+    """Measures starting and joining `count` threads, as the loop does for every case."""
+    def run():
+        threads = [threading.Thread(target=lambda: None) for _ in range(count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    latencies, _ = _timed_parallel(run, 1, repeat)
+    return statistics.median(latencies)
+
+
+def bench_loop(language, cases, engine="thread", concurrency=4):
+    """Measures how many cases per second the full `StressTester` loop sustains.
+
+    The clock starts once compilation has finished, so only the loop is measured.
+    """
+    log_queue = queue.Queue()
+    args = (
+        ECHO_GENERATORS[language], language,
+        ECHO_PROGRAMS[language], language,
+        ECHO_PROGRAMS[language], language,
+        log_queue,
+    )
+    if engine == "async":
+        tester = AsyncStressTester(*args, timeout=30, max_cases=cases, concurrency=concurrency)
+    else:
+        tester = StressTester(*args, timeout=30, max_cases=cases)
+    tester.start()
+    start = time.perf_counter()
+    while tester.running or not log_queue.empty():
+        try:
+            msg = log_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if msg.startswith("Compilation successful"):
+            start = time.perf_counter()
+            break
+    tester.thread.join()
+    elapsed = time.perf_counter() - start
+    result = {
+        'cases': tester.case_count,
+        'throughput': tester.case_count / elapsed,
+    }
+    if engine != "async":
+        # B and C run on a thread each.
+        result['thread_ms'] = bench_threads(2) * 1000
+    return result
+
+
+def run_suite(languages, sizes, concurrencies, repeat, loop_cases):
+    results = {}
+    for language in languages:
+        for size in sizes:
+            for concurrency in concurrencies:
+                key = f"run/{language}/{size}B/x{concurrency}"
+                results[key] = bench_runner(language, size, concurrency, repeat)
+                _print_result(key, results[key])
+        if loop_cases:
+            key = f"loop/{language}"
+            results[key] = bench_loop(language, loop_cases)
+            _print_result(key, results[key])
+            for concurrency in concurrencies:
+                key = f"loop-async/{language}/x{concurrency}"
+                results[key] = bench_loop(language, loop_cases, "async", concurrency)
+                _print_result(key, results[key])
+    return results
+
+
+def _print_result(key, result):
+    fields = ", ".join(f"{name}={value:.2f}" for name, value in result.items())
+    print(f"{key:<28} {fields}")
+
+
+def compare(results, baseline, tolerance=0.2, min_delta_ms=0.5):
+    """Compares results with a stored baseline.
+
+    Returns a list of human readable regression descriptions. A case regresses
+    when its throughput drops, or its harness overhead grows, by more than
+    `tolerance` (relative). Overhead changes within the measured noise of
+    either run (`overhead_noise_ms`), and never less than `min_delta_ms`, are
+    ignored.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(
+                f"{key}: throughput {result['throughput']:.2f}/s vs baseline {base['throughput']:.2f}/s"
+            )
+        if 'overhead_ms' in result and 'overhead_ms' in base:
+            delta = result['overhead_ms'] - base['overhead_ms']
+            noise = max(min_delta_ms, result.get('overhead_noise_ms', 0.0), base.get('overhead_noise_ms', 0.0))
+            if delta > noise and result['overhead_ms'] > max(base['overhead_ms'], 0) * (1 + tolerance):
+                regressions.append(
+                    f"{key}: overhead {result['overhead_ms']:.2f}ms vs baseline {base['overhead_ms']:.2f}ms"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the harness overhead of each runner.")
+    parser.add_argument("--languages", nargs="+", default=None, help="Languages to benchmark (default: all installed)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[16, 64 * 1024, 1024 * 1024], help="Input sizes in bytes")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4], help="Number of concurrent executions")
+    parser.add_argument("--repeat", type=int, default=40, help="Runs per thread for each case")
+    parser.add_argument("--loop-cases", type=int, default=50, help="Cases for the full loop benchmark (0 to skip)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before failing")
+    args = parser.parse_args(argv)
+
+    languages = args.languages or available_languages()
+    results = run_suite(languages, args.sizes, args.concurrency, args.repeat, args.loop_cases)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline found at {args.baseline}. Run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("Performance regressions detected:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+import traceback
+from core.runner import ProcessSet
+from core.tester import StressTester, reference_verdict
+
+class AsyncStressTester(StressTester):
+    """Stress tester that drives all child processes from a single asyncio loop.
+
+    Instead of blocking one OS thread per execution, `concurrency` cases are kept
+    in flight as coroutines on one event loop. Pipe I/O is non-blocking, each
+    execution has its own timeout, and stopping the test cancels every pending
+    execution (killing its process) instead of waiting for it to finish.
+    """
+
+    def __init__(self, *args, concurrency=8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.concurrency = max(1, concurrency)
+        self.checked_count = 0
+        self._loop = None
+        self._tasks = []
+
+    def stop(self):
+        self.running = False
+        self.stopped_by_user = True
+        self._kill_all()
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._cancel_tasks)
+            except RuntimeError:
+                # The loop has already been closed.
+                pass
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _cancel_tasks(self):
+        for task in self._tasks:
+            task.cancel()
+
+    def _run_loop(self):
+        self._log("Starting stress test...")
+
+        if not self._compile_all():
+            return
+
+        self._log(f"Compilation successful. Running tests ({self.concurrency} concurrent cases)...")
+
+        self.case_count = self.progress.covered
+        self.checked_count = 0
+        asyncio.run(self._run_cases())
+
+        if self.running and self._reached_case_limit():
+            self._log(f"Reached the case limit ({self.max_cases}).")
+        self.running = False
+        self._end_session()
+        self._log_results_matrix()
+        self._log("Stress test stopped.")
+
+        self._cleanup()
+
+    async def _run_cases(self):
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        # stop() may have been called before the tasks existed.
+        if not self.running:
+            self._cancel_tasks()
+        done, _ = await asyncio.wait(self._tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                # A bug, not a verdict: report it and stop the other workers.
+                self._log_internal_error("A worker crashed", task.exception())
+                self._fail()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._loop = None
+        self._tasks = []
+
+    def _fail(self):
+        self.running = False
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+
+    def _log_internal_error(self, message, error):
+        details = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        self._log(f"Error: {message}:\n{details}")
+
+    async def _run_program_async(self, name, runner, input_str, args=(), processes=None):
+        """Async counterpart of `StressTester._run_program`."""
+        start = time.perf_counter()
+        result = await runner.run_async(input_str, args, processes)
+        result = (*result, time.perf_counter() - start)
+        if self._needs_confirmation(runner, result):
+            start = time.perf_counter()
+            result = await runner.run_async(input_str, args, processes, self._confirmation_timeout(runner))
+            result = (*result, time.perf_counter() - start)
+        self._calibrate(name, runner, result)
+        self._track_slowest(name, input_str, result)
+        return result
+
+    async def _run_sibling(self, name, runner, input_str, siblings):
+        result = await self._run_program_async(name, runner, input_str, processes=siblings)
+        if result[2] != 0 and self._kills_siblings(name):
+            siblings.kill()
+        return result
+
+    async def _worker(self):
+        while self.running and not self._reached_case_limit():
+            case_count = self._next_case()
+
+            input_str, stderr, ret, time_a = await self._run_program_async("A", self.runner_a, "", self._generator_args(case_count))
+            if not self.running:
+                return
+            if ret != 0:
+                self._finish_case(case_count, {"A": self._generator_failure_messages(case_count, stderr)}, None,
+                                  {"A": time_a})
+                self._fail()
+                return
+
+            key, cached = self._lookup_reference(input_str)
+            if cached is not None and self.dedupe and cached[1]:
+                if not self._finish_case(case_count, {}, {}, {"A": time_a}, input_str=input_str):
+                    self._fail()
+                    return
+                self._count_checked()
+                continue
+
+            # return_exceptions keeps gather from finishing before every child
+            # has reaped its process when the worker is cancelled.
+            siblings = ProcessSet()
+            runners = self._active_runners()
+            if cached is None:
+                runners = [("B", self.runner_b)] + runners
+            results = await asyncio.gather(
+                *(self._run_sibling(name, runner, input_str, siblings) for name, runner in runners),
+                return_exceptions=True,
+            )
+            if not self.running:
+                return
+            results = dict(zip((name for name, _ in runners), results))
+            errors = {name: result for name, result in results.items() if isinstance(result, BaseException)}
+            for error in errors.values():
+                if isinstance(error, asyncio.CancelledError):
+                    raise error
+            if errors:
+                for name, error in errors.items():
+                    self._log_internal_error(f"Running {name} failed (Case {case_count})", error)
+                self._fail()
+                return
+            times = {"A": time_a}
+            times.update({name: result[3] for name, result in results.items()})
+            result_b = results.pop("B") if cached is None else cached[0]
+            messages, verdicts = self._judge(case_count, input_str, result_b, results)
+            self._remember_reference(key, result_b, verdicts)
+            if not self._finish_case(case_count, messages, verdicts, times, input_str=input_str,
+                                     reference_verdict=reference_verdict(result_b)):
+                self._fail()
+                return
+
+            self._count_checked()
+
+    def _count_checked(self):
+        self.checked_count += 1
+        if self.checked_count % 10 == 0:
+            self._log(f"Checked {self.checked_count} cases...")
@@ -0,0 +1,46 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+class OutputCache:
+    """Bounded LRU cache of reference results, keyed by a hash of the input.
+
+    Each entry stores the reference's (stdout, stderr, returncode) and whether
+    every candidate has already passed on that input ("known good").
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(input_str):
+        return hashlib.blake2b(input_str.encode(), digest_size=16).digest()
+
+    def get(self, key):
+        """Returns (result, known_good) for `key`, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, result, known_good):
+        with self._lock:
+            previous = self._entries.get(key)
+            # Once known good, an input stays known good.
+            known_good = known_good or (previous is not None and previous[1])
+            self._entries[key] = (result, known_good)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
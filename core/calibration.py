@@ -0,0 +1,62 @@
+import threading
+from collections import deque
+
+def percentile(values, q):
+    """Returns the q-th quantile (0 <= q <= 1) of `values` by nearest rank."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+class TimeoutCalibrator:
+    """Derives a timeout per program from its measured runtimes.
+
+    After `warmup` successful runs of a program, its timeout becomes
+    `multiplier` times the p99 of its recent runtimes, kept between `floor`
+    and `ceiling`. Only the last `window` runtimes are considered and the
+    timeouts are recomputed every `recalibrate_every` runs, so they follow
+    changes in machine load.
+    """
+
+    def __init__(self, warmup=20, multiplier=3.0, ceiling=None, floor=0.05, window=500, recalibrate_every=50):
+        self.warmup = warmup
+        self.multiplier = multiplier
+        self.ceiling = ceiling
+        self.floor = floor
+        self.window = window
+        self.recalibrate_every = recalibrate_every
+        self.timeouts = {}
+        self._samples = {}
+        self._since_update = {}
+        self._lock = threading.Lock()
+
+    def settings(self):
+        """Returns the constructor arguments, e.g. to build an identical calibrator elsewhere."""
+        return {
+            "warmup": self.warmup,
+            "multiplier": self.multiplier,
+            "ceiling": self.ceiling,
+            "floor": self.floor,
+            "window": self.window,
+            "recalibrate_every": self.recalibrate_every,
+        }
+
+    def record(self, name, elapsed):
+        """Records a successful run. Returns the new timeout if it was recomputed, else None."""
+        with self._lock:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+            samples.append(elapsed)
+            self._since_update[name] = self._since_update.get(name, 0) + 1
+            if len(samples) < self.warmup:
+                return None
+            if name in self.timeouts and self._since_update[name] < self.recalibrate_every:
+                return None
+            self._since_update[name] = 0
+            timeout = max(self.floor, self.multiplier * percentile(samples, 0.99))
+            if self.ceiling is not None:
+                timeout = min(timeout, self.ceiling)
+            self.timeouts[name] = timeout
+            return timeout
+
+    def is_calibrated(self, name):
+        with self._lock:
+            return name in self.timeouts
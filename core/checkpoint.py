@@ -0,0 +1,140 @@
+"""Checkpoints of long-running stress-test sessions.
+
+A checkpoint file is append-only JSONL: every line is a complete snapshot of
+the session, so writing one costs a single small append. On load the last
+line that parses wins, which makes a line torn by a crash harmless.
+"""
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+
+CHECKPOINT_VERSION = 1
+
+def fingerprint(sources):
+    """Returns a short hash of the (code, language) pairs of a session."""
+    data = json.dumps(sources).encode()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+class CaseProgress:
+    """Tracks which case numbers are done when cases finish out of order.
+
+    Every case up to `covered` is done; `done` holds the finished cases above
+    it. Cases that were started but not finished are `pending`.
+    """
+
+    def __init__(self, covered=0, done=()):
+        self.covered = covered
+        self.done = set(done)
+        self.pending = set()
+
+    def start(self, case_count):
+        self.pending.add(case_count)
+
+    def finish(self, case_count):
+        self.pending.discard(case_count)
+        if case_count <= self.covered:
+            return
+        self.done.add(case_count)
+        while self.covered + 1 in self.done:
+            self.covered += 1
+            self.done.remove(self.covered)
+
+    def is_done(self, case_count):
+        return case_count <= self.covered or case_count in self.done
+
+    def count(self):
+        """Returns the number of finished cases."""
+        return self.covered + len(self.done)
+
+class TimingStats:
+    """Aggregated run times per program plus the slowest runs overall."""
+
+    def __init__(self, slowest_count=10):
+        self.slowest_count = slowest_count
+        # name -> [count, total, min, max]
+        self.programs = {}
+        # Min-heap of (elapsed, case, name), so the fastest is evicted first.
+        self.slowest = []
+
+    def record(self, case_count, times):
+        for name, elapsed in times.items():
+            entry = self.programs.get(name)
+            if entry is None:
+                self.programs[name] = [1, elapsed, elapsed, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = min(entry[2], elapsed)
+                entry[3] = max(entry[3], elapsed)
+            if name == "A":
+                continue
+            item = (elapsed, case_count, name)
+            if len(self.slowest) < self.slowest_count:
+                heapq.heappush(self.slowest, item)
+            elif item > self.slowest[0]:
+                heapq.heapreplace(self.slowest, item)
+
+    def to_dict(self):
+        return {
+            "programs": {
+                name: {"count": count, "total": total, "min": low, "max": high}
+                for name, (count, total, low, high) in self.programs.items()
+            },
+            "slowest": [list(item) for item in sorted(self.slowest, reverse=True)],
+        }
+
+    @classmethod
+    def from_dict(cls, data, slowest_count=10):
+        stats = cls(slowest_count)
+        for name, entry in data.get("programs", {}).items():
+            stats.programs[name] = [entry["count"], entry["total"], entry["min"], entry["max"]]
+        stats.slowest = [tuple(item) for item in data.get("slowest", [])][:slowest_count]
+        heapq.heapify(stats.slowest)
+        return stats
+
+class SessionCheckpoint:
+    """Appends session snapshots to a JSONL file at most every `interval` seconds.
+
+    Unless `append` is set (to resume a session), the first write replaces
+    whatever an earlier session left in the file.
+    """
+
+    def __init__(self, path, interval=10.0, append=False):
+        self.path = path
+        self.interval = interval
+        self._mode = "a" if append else "w"
+        self._last_write = time.monotonic()
+        self._lock = threading.Lock()
+
+    def due(self):
+        return time.monotonic() - self._last_write >= self.interval
+
+    def write(self, state):
+        line = json.dumps(dict(state, version=CHECKPOINT_VERSION, time=time.time())) + "\n"
+        with self._lock:
+            with open(self.path, self._mode, encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                # The point is to survive a machine restart, not just a crash.
+                os.fsync(f.fileno())
+            self._mode = "a"
+            self._last_write = time.monotonic()
+
+    def load(self):
+        """Returns the latest complete snapshot, or None if there is none."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+        for line in reversed(lines):
+            try:
+                state = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(state, dict) and state.get("version") == CHECKPOINT_VERSION:
+                return state
+        return None
@@ -0,0 +1,418 @@
+"""Distributed stress testing.
+
+A worker daemon (`python -m core.distributed --listen HOST:PORT`, run from the
+project root) accepts connections from a coordinator (`DistributedStressTester`).
+The coordinator ships the sources once, each worker compiles them locally,
+and then the coordinator streams batches of case numbers. Case N always runs the generator
+with the seed `seed_start + N - 1`, so any failure can be reproduced locally.
+
+Messages are newline-delimited JSON objects in both directions:
+
+    coordinator -> worker
+        {"op": "setup", "token": "...", "sources": [[code, lang], ...], "timeout": t, "seed_start": s,
+         "cache_size": n, "dedupe": bool, "interpreters": {name: interpreter},
+         "calibration": {...} or null}
+        {"op": "run", "cases": [n, ...], "active": ["C", ...]}
+        {"op": "stop"}
+    worker -> coordinator
+        {"op": "ready"} | {"op": "error", "message": "..."}
+        {"op": "result", "case": n, "messages": {...}, "verdicts": {...}, "times": {...},
+         "input": "..." or null, "reference_verdict": "TLE" | "RE" | null}
+        {"op": "batch_done"}
+
+Sources are ordered A, B, C followed by any extra candidates (D, E, ...), and
+"active" lists the candidates that have not failed yet. Addresses are either "host:port" (TCP) or "unix:/path/to/socket".
+
+The daemon runs whatever code it is sent. A daemon started with a shared
+token rejects any setup that does not carry the same token, and the daemon
+refuses to listen on a non-loopback address without one. Tokens travel in
+plain text, so only expose workers on trusted networks.
+"""
+import argparse
+import hmac
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from core.tester import StressTester, random_seed_start, VERDICT_OK
+from core.calibration import TimeoutCalibrator
+
+def parse_address(address):
+    """Returns (family, sockaddr) for a "host:port" or "unix:/path" address."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+def connect(address, timeout=10):
+    family, sockaddr = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(sockaddr)
+    sock.settimeout(None)
+    return sock
+
+class _Channel:
+    """Newline-delimited JSON over a stream socket. `send` is thread-safe."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.rfile = sock.makefile("rb")
+        self.wfile = sock.makefile("wb")
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        data = (json.dumps(message) + "\n").encode()
+        with self._lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    def recv(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        return json.loads(line)
+
+    def close(self):
+        for f in (self.rfile, self.wfile):
+            try:
+                f.close()
+            except OSError:
+                pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+class WorkerSession:
+    """The state of one coordinator connection on a worker."""
+
+    def __init__(self, channel, jobs, token=None):
+        self.channel = channel
+        self.jobs = jobs
+        self.token = token
+        self.tester = None
+        self.stopped = False
+        self.batch_thread = None
+
+    def dispatch(self, message):
+        op = message.get("op")
+        if op == "setup":
+            self._setup(message)
+        elif self.tester is None:
+            # Nothing may run before a successful setup.
+            return
+        elif op == "run":
+            self.stopped = False
+            self.tester.active_candidates = list(message.get("active", self.tester.active_candidates))
+            self.batch_thread = threading.Thread(target=self._run_batch, args=(message["cases"],), daemon=True)
+            self.batch_thread.start()
+        elif op == "stop":
+            self.stopped = True
+            if self.tester:
+                self.tester._kill_all()
+
+    def _setup(self, message):
+        if self.token is not None and not hmac.compare_digest(str(message.get("token", "")), self.token):
+            self.channel.send({"op": "error", "message": "Invalid token."})
+            return
+        (code_a, lang_a), (code_b, lang_b), (code_c, lang_c), *candidates = message["sources"]
+        log_queue = queue.Queue()
+        self.tester = StressTester(
+            code_a, lang_a, code_b, lang_b, code_c, lang_c, log_queue, message["timeout"],
+            seed_start=message.get("seed_start", 0), candidates=candidates,
+            cache_size=message.get("cache_size", 0), dedupe=message.get("dedupe", False),
+            interpreters=message.get("interpreters"),
+            calibrator=TimeoutCalibrator(**message["calibration"]) if message.get("calibration") else None
+        )
+        self.tester.running = True
+        if self.tester._compile_all():
+            self.channel.send({"op": "ready", "jobs": self.jobs})
+            return
+        errors = []
+        while not log_queue.empty():
+            errors.append(log_queue.get_nowait())
+        self.channel.send({"op": "error", "message": "\n".join(errors)})
+
+    def _run_case(self, case_count):
+        if self.stopped:
+            return
+        messages, times, verdicts, input_str, verdict_b = self.tester._run_case(case_count)
+        if self.stopped:
+            # Killed by a stop request; the result is meaningless.
+            return
+        if verdicts is None:
+            # The generator or the reference failed; the coordinator will stop.
+            self.stopped = True
+        # The input is only needed (to profile a timeout) when something failed.
+        failed = verdicts is None or any(verdict not in (VERDICT_OK, None) for verdict in verdicts.values())
+        self.channel.send({
+            "op": "result", "case": case_count, "messages": messages, "verdicts": verdicts, "times": times,
+            "input": input_str if failed else None, "reference_verdict": verdict_b,
+        })
+
+    def _run_batch(self, cases):
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                list(pool.map(self._run_case, cases))
+        finally:
+            try:
+                self.channel.send({"op": "batch_done"})
+            except OSError:
+                pass
+
+    def close(self):
+        self.stopped = True
+        if self.batch_thread:
+            self.batch_thread.join()
+        if self.tester:
+            self.tester._cleanup()
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        channel = _Channel(self.request)
+        session = WorkerSession(channel, self.server.jobs, self.server.token)
+        try:
+            while True:
+                try:
+                    message = channel.recv()
+                except (OSError, ValueError):
+                    break
+                if message is None:
+                    break
+                session.dispatch(message)
+        finally:
+            session.close()
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+class WorkerDaemon:
+    """Serves stress-test sessions to coordinators on a TCP or Unix socket."""
+
+    def __init__(self, address="127.0.0.1:0", jobs=None, token=None):
+        family, sockaddr = parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(sockaddr):
+                os.unlink(sockaddr)
+            self.server = _UnixServer(sockaddr, _WorkerHandler)
+        else:
+            self.server = _TCPServer(sockaddr, _WorkerHandler)
+        self.server.jobs = jobs or os.cpu_count() or 1
+        self.server.token = token
+        self.thread = None
+
+    @property
+    def address(self):
+        """The address coordinators should connect to (with the real port)."""
+        sockaddr = self.server.server_address
+        if isinstance(sockaddr, str):
+            return f"unix:{sockaddr}"
+        return f"{sockaddr[0]}:{sockaddr[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if isinstance(self.server.server_address, str) and os.path.exists(self.server.server_address):
+            os.unlink(self.server.server_address)
+
+class DistributedStressTester(StressTester):
+    """Runs the stress test on a fleet of worker daemons.
+
+    Follows the same start/stop lifecycle and log protocol as `StressTester`.
+    The first failure reported by any worker stops the whole fleet. Without a
+    `seed_start`, a random one is used (and logged), so that consecutive runs
+    check different inputs. `token` is sent to workers that require one.
+    """
+
+    def __init__(self, code_a, lang_a, code_b, lang_b, code_c, lang_c, log_queue, timeout,
+                 workers, batch_size=16, token=None, **kwargs):
+        super().__init__(code_a, lang_a, code_b, lang_b, code_c, lang_c, log_queue, timeout, **kwargs)
+        if self.seed_start is None:
+            self.seed_start = random_seed_start()
+        self.token = token
+        self.sources = [[code_a, lang_a], [code_b, lang_b], [code_c, lang_c]]
+        self.sources += [list(candidate) for candidate in kwargs.get("candidates", ())]
+        self.workers = list(workers)
+        self.batch_size = batch_size
+        self.checked_count = 0
+        self.channels = {}
+        self._lock = threading.Lock()
+        self._retry = []
+        self._failed = False
+
+    def stop(self):
+        self.running = False
+        self.stopped_by_user = True
+        self._broadcast_stop()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _broadcast_stop(self):
+        for channel in list(self.channels.values()):
+            try:
+                channel.send({"op": "stop"})
+            except OSError:
+                pass
+
+    def _connect_all(self):
+        for address in self.workers:
+            self._log(f"Connecting to worker {address}...")
+            try:
+                channel = _Channel(connect(address))
+                channel.send({
+                    "op": "setup",
+                    "token": self.token,
+                    "sources": self.sources,
+                    "timeout": self.timeout,
+                    "seed_start": self.seed_start,
+                    "cache_size": self.output_cache.max_entries if self.output_cache else 0,
+                    "dedupe": self.dedupe,
+                    "interpreters": self.interpreters,
+                    "calibration": self.calibrator.settings() if self.calibrator else None,
+                })
+                reply = channel.recv()
+            except (OSError, ValueError) as e:
+                self._log(f"Could not reach worker {address}: {e}")
+                return False
+            self.channels[address] = channel
+            if reply is None:
+                self._log(f"Worker {address} closed the connection during setup.")
+                return False
+            if reply["op"] == "error":
+                self._log(f"Worker {address} rejected the session:\n{reply['message']}")
+                return False
+        return True
+
+    def _next_batch(self):
+        with self._lock:
+            if not self.running:
+                return []
+            batch = self._retry[:self.batch_size]
+            del self._retry[:len(batch)]
+            while len(batch) < self.batch_size and not self._reached_case_limit():
+                batch.append(self._next_case())
+            return batch
+
+    def _record_result(self, address, result):
+        with self._lock:
+            if self._failed:
+                return
+            verdicts = result["verdicts"]
+            if not self._finish_case(result["case"], result["messages"], verdicts, result["times"], address,
+                                     result.get("input"), result.get("reference_verdict")):
+                self._failed = True
+                self.running = False
+            elif verdicts is not None:
+                self.checked_count += 1
+                if self.checked_count % 10 == 0:
+                    self._log(f"Checked {self.checked_count} cases...")
+        if self._failed:
+            self._broadcast_stop()
+
+    def _drive(self, address, channel):
+        while self.running:
+            batch = self._next_batch()
+            if not batch:
+                return
+            done = set()
+            try:
+                with self._results_lock:
+                    active = list(self.active_candidates)
+                channel.send({"op": "run", "cases": batch, "active": active})
+                while True:
+                    message = channel.recv()
+                    if message is None:
+                        raise OSError("connection closed")
+                    if message["op"] == "batch_done":
+                        break
+                    if message["op"] == "result":
+                        done.add(message["case"])
+                        self._record_result(address, message)
+            except (OSError, ValueError) as e:
+                self._log(f"Lost connection to worker {address}: {e}")
+                with self._lock:
+                    self._retry.extend(case for case in batch if case not in done)
+                return
+
+    def _run_loop(self):
+        self._log("Starting stress test...")
+
+        try:
+            if not self._connect_all():
+                self.running = False
+                return
+
+            self._log(f"Compilation successful. Running tests on {len(self.channels)} workers...")
+            self._log(f"Seed start {self.seed_start}: case N runs the generator with seed {self.seed_start} + N - 1.")
+
+            self.case_count = self.progress.covered
+            self.checked_count = 0
+            threads = [
+                threading.Thread(target=self._drive, args=(address, channel))
+                for address, channel in self.channels.items()
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            if self.running:
+                # Every driver returned without a failure or a stop request.
+                if self._reached_case_limit() and not self._retry:
+                    self._log(f"Reached the case limit ({self.max_cases}).")
+                else:
+                    self._log("All workers were lost. Stopping.")
+            self.running = False
+            self._end_session()
+            self._log_results_matrix()
+            self._log("Stress test stopped.")
+        finally:
+            for channel in self.channels.values():
+                channel.close()
+            self.channels = {}
+            self._cleanup()
+
+def _is_local(address):
+    family, sockaddr = parse_address(address)
+    if family == socket.AF_UNIX:
+        return True
+    return sockaddr[0] in ("127.0.0.1", "localhost", "::1")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress tester worker daemon.")
+    parser.add_argument("--listen", default="127.0.0.1:9000", help='"host:port" or "unix:/path" (default: 127.0.0.1:9000)')
+    parser.add_argument("--jobs", type=int, default=None, help="Cases run in parallel per connection (default: CPU count)")
+    parser.add_argument("--token", default=os.environ.get("STRESS_TESTER_TOKEN"),
+                        help="Shared token coordinators must send (default: $STRESS_TESTER_TOKEN)")
+    args = parser.parse_args(argv)
+
+    if not args.token and not _is_local(args.listen):
+        parser.error("listening on a non-loopback address requires --token")
+
+    daemon = WorkerDaemon(args.listen, args.jobs, args.token)
+    print(f"Worker listening on {daemon.address} with {daemon.server.jobs} jobs")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.shutdown()
+
+if __name__ == "__main__":
+    main()
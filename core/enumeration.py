@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from core.tester import StressTester, VERDICT_OK
+
+class EnumerationTester(StressTester):
+    """Checks every input of a finite input space instead of random ones.
+
+    The generator is run as `generator <index> <total>` for every index in
+    [0, total) and must print the index-th input. Indices are handed out in
+    increasing order to `shards` parallel workers, each of which runs its own
+    generator and solution processes. Finished cases are judged in index
+    order, so the failure reported for each candidate is always its smallest
+    failing index. A failed candidate is retired and the remaining ones go on
+    through the whole space; no index is started once no candidate is left
+    (or the generator or B failed).
+    """
+
+    PROGRESS_INTERVAL = 1.0
+
+    def __init__(self, *args, total, shards=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.total = total
+        self.shards = max(1, shards or os.cpu_count() or 1)
+        # A resumed session continues after the indices it already covered.
+        self.covered = self.progress.count()
+        # The ETA only counts what this session covered, since `elapsed` does too.
+        self._covered_at_start = self.covered
+        self.first_failing_index = None
+        self._cursor = self.progress.covered
+        # Finished cases waiting for every smaller index to finish: index -> result.
+        self._finished = {}
+        self._next_to_judge = self.progress.covered
+        self._ended = False
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._last_progress = 0.0
+
+    def _generator_args(self, case_count):
+        return (str(case_count - 1), str(self.total))
+
+    def _next_index(self):
+        with self._lock:
+            if not self.running or self._ended or self._cursor >= self.total:
+                return None
+            while self._cursor < self.total and self.progress.is_done(self._cursor + 1):
+                self._cursor += 1
+            if self._cursor >= self.total:
+                return None
+            index = self._cursor
+            self._cursor += 1
+        with self._results_lock:
+            self.progress.start(index + 1)
+        return index
+
+    def _shard(self):
+        while True:
+            index = self._next_index()
+            if index is None:
+                return
+            messages, times, verdicts, input_str, verdict_b = self._run_case(index + 1)
+            if not self.running:
+                return
+            with self._lock:
+                self.covered += 1
+                self._finished[index] = (messages, verdicts, times, input_str, verdict_b)
+                self._judge_finished()
+            self._report_progress()
+
+    def _judge_finished(self, skip_gaps=False):
+        """Judges finished cases in index order. Call with `_lock` held.
+
+        Stops at the first index that has not finished yet, unless `skip_gaps`
+        is set (for the cases left over when the user stops the test).
+        """
+        while self._finished and not self._ended:
+            while self._next_to_judge < self.total and self.progress.is_done(self._next_to_judge + 1):
+                self._next_to_judge += 1
+            index = self._next_to_judge if self._next_to_judge in self._finished else None
+            if index is None:
+                if not skip_gaps:
+                    return
+                index = min(self._finished)
+            messages, verdicts, times, input_str, verdict_b = self._finished.pop(index)
+            self._next_to_judge = index + 1
+            with self._results_lock:
+                failed = verdicts is None or any(
+                    verdict not in (VERDICT_OK, None) and name in self.active_candidates
+                    for name, verdict in verdicts.items()
+                )
+            if failed and self.first_failing_index is None:
+                self.first_failing_index = index
+                self._log(f"First failing index: {index}")
+            if not self._finish_case(index + 1, messages, verdicts, times, input_str=input_str,
+                                     reference_verdict=verdict_b):
+                self._ended = True
+                self._finished.clear()
+
+    def _report_progress(self, force=False):
+        now = time.perf_counter()
+        with self._lock:
+            if not force and now - self._last_progress < self.PROGRESS_INTERVAL:
+                return
+            self._last_progress = now
+            covered = self.covered
+        self._log(self.progress_text(covered, now - self._started_at))
+
+    def progress_text(self, covered, elapsed):
+        percent = 100.0 * covered / self.total if self.total else 100.0
+        text = f"Covered {covered}/{self.total} ({percent:.1f}%)"
+        covered_now = covered - self._covered_at_start
+        if covered_now > 0 and covered < self.total:
+            remaining = elapsed / covered_now * (self.total - covered)
+            text += f", ETA {_format_duration(remaining)}"
+        return text
+
+    def _run_loop(self):
+        self._log("Starting stress test...")
+
+        if not self._compile_all():
+            return
+
+        self._log(f"Compilation successful. Enumerating {self.total} inputs on {self.shards} shards...")
+
+        self._started_at = time.perf_counter()
+        threads = [threading.Thread(target=self._shard) for _ in range(self.shards)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stopped_by_user = not self.running
+        with self._lock:
+            self._judge_finished(skip_gaps=True)
+        self._report_progress(force=True)
+        self.case_count = self.covered
+
+        if not stopped_by_user and not self._ended:
+            if self.first_failing_index is None:
+                self._log(f"Enumeration complete: all {self.total} inputs passed.")
+            else:
+                self._log(
+                    f"Enumeration complete: {', '.join(self.active_candidates)} passed all {self.total} inputs."
+                )
+        self.running = False
+        self._end_session()
+        self._log_results_matrix()
+        self._log("Stress test stopped.")
+
+        self._cleanup()
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
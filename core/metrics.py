@@ -0,0 +1,231 @@
+"""Metrics for dashboards and offline analysis.
+
+`Metrics` collects counters, gauges and histograms and renders them in the
+Prometheus text format; `MetricsServer` serves them on http://HOST:PORT/metrics.
+`CaseLog` writes one JSON record per case from a background thread.
+"""
+import bisect
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the run time histogram buckets.
+RUN_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Metrics:
+    """Thread-safe metrics of stress-test sessions.
+
+    Counters accumulate across sessions, so one instance can back a long-lived
+    endpoint while sessions come and go.
+    """
+
+    def __init__(self, buckets=RUN_TIME_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.cases = 0
+        # (solution, verdict) -> count
+        self.verdicts = {}
+        # program -> count
+        self.fatal_errors = {}
+        # program -> [bucket counts..., +Inf count], sum
+        self._histograms = {}
+        self._histogram_sums = {}
+        # worker -> seconds
+        self.busy_seconds = {}
+        self.gauges = {"log_queue_depth": 0, "cases_in_flight": 0}
+
+    def record_case(self, times, worker="local"):
+        """Records a finished case with the run time of each program in it."""
+        with self._lock:
+            self.cases += 1
+            for program, elapsed in times.items():
+                counts = self._histograms.get(program)
+                if counts is None:
+                    counts = self._histograms[program] = [0] * (len(self.buckets) + 1)
+                    self._histogram_sums[program] = 0.0
+                counts[bisect.bisect_left(self.buckets, elapsed)] += 1
+                self._histogram_sums[program] += elapsed
+            # The generator runs first, then the solutions run side by side.
+            solutions = [elapsed for program, elapsed in times.items() if program != "A"]
+            busy = times.get("A", 0.0) + max(solutions, default=0.0)
+            self.busy_seconds[worker] = self.busy_seconds.get(worker, 0.0) + busy
+
+    def record_verdict(self, solution, verdict):
+        with self._lock:
+            key = (solution, verdict)
+            self.verdicts[key] = self.verdicts.get(key, 0) + 1
+
+    def record_fatal_error(self, program):
+        with self._lock:
+            self.fatal_errors[program] = self.fatal_errors.get(program, 0) + 1
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def take_delta(self):
+        """Returns everything counted since the last call and resets the counts.
+
+        Gauges are copied, not reset. The result can be sent to another
+        process and added to its metrics with `absorb`.
+        """
+        with self._lock:
+            delta = {
+                "cases": self.cases,
+                "verdicts": self.verdicts,
+                "fatal_errors": self.fatal_errors,
+                "histograms": self._histograms,
+                "histogram_sums": self._histogram_sums,
+                "busy_seconds": self.busy_seconds,
+                "gauges": dict(self.gauges),
+            }
+            self.cases = 0
+            self.verdicts = {}
+            self.fatal_errors = {}
+            self._histograms = {}
+            self._histogram_sums = {}
+            self.busy_seconds = {}
+        return delta
+
+    def absorb(self, delta):
+        """Adds a delta from `take_delta` (with the same buckets) to these metrics."""
+        with self._lock:
+            self.cases += delta["cases"]
+            for target, source in [
+                (self.verdicts, delta["verdicts"]),
+                (self.fatal_errors, delta["fatal_errors"]),
+                (self._histogram_sums, delta["histogram_sums"]),
+                (self.busy_seconds, delta["busy_seconds"]),
+            ]:
+                for key, value in source.items():
+                    target[key] = target.get(key, 0) + value
+            for program, counts in delta["histograms"].items():
+                target = self._histograms.setdefault(program, [0] * (len(self.buckets) + 1))
+                for i, count in enumerate(counts):
+                    target[i] += count
+            self.gauges.update(delta["gauges"])
+
+    def render(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP stress_cases_total Cases finished.",
+                "# TYPE stress_cases_total counter",
+                f"stress_cases_total {self.cases}",
+                "# HELP stress_verdicts_total Verdicts per candidate solution.",
+                "# TYPE stress_verdicts_total counter",
+            ]
+            for (solution, verdict), count in sorted(self.verdicts.items()):
+                lines.append(f'stress_verdicts_total{{solution="{solution}",verdict="{verdict}"}} {count}')
+            lines += [
+                "# HELP stress_fatal_errors_total Failures of the generator or the reference that ended a session.",
+                "# TYPE stress_fatal_errors_total counter",
+            ]
+            for program, count in sorted(self.fatal_errors.items()):
+                lines.append(f'stress_fatal_errors_total{{program="{program}"}} {count}')
+            lines += [
+                "# HELP stress_run_seconds Wall-clock run time per program.",
+                "# TYPE stress_run_seconds histogram",
+            ]
+            for program, counts in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    lines.append(f'stress_run_seconds_bucket{{program="{program}",le="{bound}"}} {cumulative}')
+                lines.append(f'stress_run_seconds_sum{{program="{program}"}} {self._histogram_sums[program]}')
+                lines.append(f'stress_run_seconds_count{{program="{program}"}} {cumulative}')
+            lines += [
+                "# HELP stress_worker_busy_seconds_total Time workers spent running cases.",
+                "# TYPE stress_worker_busy_seconds_total counter",
+            ]
+            for worker, seconds in sorted(self.busy_seconds.items()):
+                lines.append(f'stress_worker_busy_seconds_total{{worker="{worker}"}} {seconds}')
+            for name, value in sorted(self.gauges.items()):
+                lines += [f"# TYPE stress_{name} gauge", f"stress_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are periodic; do not spam stderr.
+        pass
+
+class MetricsServer:
+    """Serves `metrics` at /metrics. Binds to localhost by default."""
+
+    def __init__(self, metrics, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = metrics
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class CaseLog:
+    """Appends one JSON record per case to a file without blocking the caller.
+
+    Records are queued and written in batches by a background thread, which
+    starts with the first record. `close` writes the remaining records.
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._drain, daemon=True)
+                    self._thread.start()
+        self._queue.put(record)
+
+    def _drain(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                lines = []
+                while record is not self._CLOSE:
+                    lines.append(json.dumps(record) + "\n")
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                f.writelines(lines)
+                f.flush()
+                if record is self._CLOSE:
+                    return
+
+    def close(self):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(self._CLOSE)
+            thread.join()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import time
+from core.runner import PythonRunner
+
+# Interpreter names looked up on PATH, in order of preference.
+KNOWN_INTERPRETERS = ["python", "python3", "pypy3", "pypy"]
+
+def available_interpreters():
+    """Returns the known Python interpreters found on PATH.
+
+    Names that resolve to the same executable (e.g. python and python3) are
+    reported once.
+    """
+    found = []
+    seen = set()
+    for name in KNOWN_INTERPRETERS:
+        path = shutil.which(name)
+        if not path:
+            continue
+        real = os.path.realpath(path)
+        if real in seen:
+            continue
+        seen.add(real)
+        found.append(name)
+    return found
+
+def probe_interpreters(code, inputs, interpreters, timeout, args=None):
+    """Runs `code` on every input under each interpreter.
+
+    `args` optionally gives the command-line arguments of each run, in the
+    same order as `inputs`. Returns a dict mapping each interpreter to its total run time in seconds,
+    or None if it failed (not installed, crashed or timed out) on any input.
+    """
+    timings = {}
+    for interpreter in interpreters:
+        runner = PythonRunner(code, "python", timeout, interpreter)
+        try:
+            runner.compile()
+            total = 0.0
+            for input_str, argv in zip(inputs, args or [()] * len(inputs)):
+                start = time.perf_counter()
+                _, _, returncode = runner.run(input_str, argv)
+                total += time.perf_counter() - start
+                if returncode != 0:
+                    total = None
+                    break
+            timings[interpreter] = total
+        finally:
+            runner.cleanup()
+    return timings
+
+def fastest_interpreter(timings):
+    """Returns the interpreter with the lowest time, or None if all failed."""
+    working = {name: t for name, t in timings.items() if t is not None}
+    if not working:
+        return None
+    return min(working, key=working.get)
+
+def format_probe(timings, baseline=None):
+    """Formats probe results as runtime ratios relative to `baseline`.
+
+    The baseline defaults to the first interpreter that worked.
+    """
+    working = [name for name, t in timings.items() if t is not None]
+    if baseline not in working:
+        baseline = working[0] if working else None
+    lines = []
+    for name, t in timings.items():
+        if t is None:
+            lines.append(f"  {name}: failed")
+        else:
+            lines.append(f"  {name}: {t * 1000:.1f} ms ({t / max(timings[baseline], 1e-9):.2f}x {baseline})")
+    return "\n".join(lines)
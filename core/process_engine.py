@@ -0,0 +1,206 @@
+"""Hosts a stress-test engine in a child process.
+
+The engine's loop, output comparisons and diffing then run on their own
+interpreter instead of competing with the GUI for the GIL. The parent
+controls the child over a pipe:
+
+    parent -> child    ("start",) | ("stop",) | ("status",)
+    child -> parent    ("log", message) | ("metrics", delta) | ("status", {...})
+                       ("finished", {...})
+
+The child always uses the "spawn" start method, so it does not inherit the
+GUI's threads or Tk state.
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from core.tester import StressTester
+from core.async_engine import AsyncStressTester
+from core.distributed import DistributedStressTester
+from core.enumeration import EnumerationTester
+from core.calibration import TimeoutCalibrator
+from core.metrics import Metrics
+
+ENGINES = {
+    "thread": StressTester,
+    "async": AsyncStressTester,
+    "distributed": DistributedStressTester,
+    "enumerate": EnumerationTester,
+}
+
+# Seconds between metric updates sent by the child.
+METRICS_INTERVAL = 0.5
+
+class ProcessStressTester:
+    """Runs one of the ENGINES in a child process with the `StressTester` lifecycle.
+
+    Takes the same arguments as the engine, preceded by the engine name. Log
+    messages are forwarded to `log_queue`. Updates to `metrics` are sent from
+    the child and added to it. The latest status reported by the child is
+    kept in `status`.
+    """
+
+    STOP_TIMEOUT = 10
+
+    def __init__(self, engine, code_a, lang_a, code_b, lang_b, code_c, lang_c, log_queue, timeout, **kwargs):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+        self.log_queue = log_queue
+        # Neither can be pickled; the child builds its own and reports back.
+        self.metrics = kwargs.pop("metrics", None)
+        calibrator = kwargs.pop("calibrator", None)
+        kwargs["calibration"] = calibrator.settings() if calibrator is not None else None
+        kwargs["metrics"] = self.metrics is not None
+        self._args = (code_a, lang_a, code_b, lang_b, code_c, lang_c, timeout)
+        self._kwargs = kwargs
+        self.running = False
+        self.status = {}
+        self.thread = None
+        self.process = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._stop_deadline = None
+
+    def start(self):
+        if self.running:
+            return
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_engine_main, args=(child_conn, self.engine, self._args, self._kwargs), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.running = True
+        self._stop_deadline = None
+        self._send(("start",))
+        self.thread = threading.Thread(target=self._receive, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Asks the engine to stop and returns immediately.
+
+        The child kills every running execution as soon as it receives the
+        command; `running` turns False once it reports that it has finished.
+        If it does not within STOP_TIMEOUT seconds, it is terminated.
+        """
+        if self._stop_deadline is None:
+            self._stop_deadline = time.monotonic() + self.STOP_TIMEOUT
+        self._send(("stop",))
+
+    def request_status(self):
+        """Asks the child for its status; the reply updates `status`."""
+        self._send(("status",))
+
+    def _send(self, message):
+        if self._conn is None:
+            return
+        try:
+            with self._send_lock:
+                self._conn.send(message)
+        except (OSError, ValueError):
+            # The child has already exited.
+            pass
+
+    def _receive(self):
+        try:
+            while True:
+                try:
+                    if not self._conn.poll(0.1):
+                        if self._stop_deadline is not None and time.monotonic() > self._stop_deadline:
+                            self.log_queue.put("The engine process did not stop in time and was terminated.")
+                            self.process.terminate()
+                            break
+                        continue
+                    kind, payload = self._conn.recv()
+                except (EOFError, OSError):
+                    if self.running:
+                        self.log_queue.put("The engine process exited unexpectedly.")
+                    break
+                if kind == "log":
+                    self.log_queue.put(payload)
+                elif kind == "metrics":
+                    if self.metrics is not None:
+                        self.metrics.absorb(payload)
+                elif kind == "status":
+                    self.status = payload
+                elif kind == "finished":
+                    self.status = payload
+                    break
+        finally:
+            self.running = False
+            self.process.join()
+            self._conn.close()
+
+def _status(tester):
+    return {
+        "running": tester.running,
+        "case_count": tester.case_count,
+        "covered": tester.progress.count(),
+        "results": tester.results,
+        "first_failures": dict(tester.first_failures),
+        "active_candidates": list(tester.active_candidates),
+    }
+
+def _engine_main(conn, engine, args, kwargs):
+    """Entry point of the child process."""
+    code_a, lang_a, code_b, lang_b, code_c, lang_c, timeout = args
+    kwargs = dict(kwargs)
+    calibration = kwargs.pop("calibration")
+    kwargs["calibrator"] = TimeoutCalibrator(**calibration) if calibration else None
+    metrics = Metrics() if kwargs.pop("metrics") else None
+    kwargs["metrics"] = metrics
+    log_queue = queue.Queue()
+    tester = ENGINES[engine](code_a, lang_a, code_b, lang_b, code_c, lang_c, log_queue, timeout, **kwargs)
+    send_lock = threading.Lock()
+    finished = threading.Event()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    def forward():
+        # Forwards log messages and metrics until the engine has finished.
+        last_metrics = time.monotonic()
+        while True:
+            done = tester.thread is not None and not tester.thread.is_alive()
+            try:
+                while True:
+                    send(("log", log_queue.get(timeout=0.05)))
+            except queue.Empty:
+                pass
+            if metrics is not None and (done or time.monotonic() - last_metrics >= METRICS_INTERVAL):
+                send(("metrics", metrics.take_delta()))
+                last_metrics = time.monotonic()
+            if done:
+                send(("finished", _status(tester)))
+                finished.set()
+                return
+
+    forwarder = threading.Thread(target=forward, daemon=True)
+    try:
+        while not finished.is_set():
+            if not conn.poll(0.1):
+                continue
+            try:
+                command = conn.recv()[0]
+            except (EOFError, OSError):
+                # The parent is gone.
+                tester.stop()
+                return
+            if command == "start":
+                tester.start()
+                forwarder.start()
+            elif command == "stop":
+                if tester.thread is None:
+                    # Stopped before it started.
+                    send(("finished", _status(tester)))
+                    return
+                tester.stop()
+            elif command == "status":
+                send(("status", _status(tester)))
+        forwarder.join()
+    finally:
+        conn.close()
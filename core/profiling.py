@@ -0,0 +1,62 @@
+"""Summaries of profiler output: the functions with the most self time."""
+import io
+import json
+import pstats
+from collections import Counter
+
+# Number of functions listed in a summary.
+PROFILE_TOP = 15
+
+def summarize_pstats(path, limit=PROFILE_TOP):
+    """Summarizes a cProfile output file. Returns (success, text)."""
+    stream = io.StringIO()
+    try:
+        stats = pstats.Stats(path, stream=stream)
+    except Exception as e:
+        # e.g. a profile written by a different Python implementation.
+        return False, f"Could not read the profile: {e}"
+    stats.strip_dirs().sort_stats("tottime").print_stats(limit)
+    return True, stream.getvalue().strip("\n")
+
+def summarize_jfr(report, limit=PROFILE_TOP):
+    """Summarizes the output of `jfr print --json --events jdk.ExecutionSample`.
+
+    Methods are ranked by the number of samples in which they were on top of
+    the stack. Returns (success, text).
+    """
+    try:
+        events = json.loads(report)["recording"]["events"]
+    except (ValueError, KeyError, TypeError) as e:
+        return False, f"Could not read the recording: {e}"
+    counts = Counter()
+    for event in events:
+        frames = (event.get("values", {}).get("stackTrace") or {}).get("frames") or []
+        if frames:
+            counts[_jfr_frame_name(frames[0])] += 1
+    total = sum(counts.values())
+    if not total:
+        return False, "The recording contains no execution samples (the run was probably too short)."
+    lines = [f"{total} execution samples", "", " samples       %  method"]
+    for name, count in counts.most_common(limit):
+        lines.append(f"{count:8d}  {100.0 * count / total:5.1f}%  {name}")
+    return True, "\n".join(lines)
+
+def _jfr_frame_name(frame):
+    method = frame.get("method") or {}
+    owner = (method.get("type") or {}).get("name", "?")
+    name = f"{owner}.{method.get('name', '?')}"
+    if frame.get("lineNumber", -1) >= 0:
+        name += f" line {frame['lineNumber']}"
+    return name
+
+def summarize_gprof(report, limit=PROFILE_TOP):
+    """Summarizes a `gprof -b -p` flat profile. Returns (success, text)."""
+    lines = report.strip("\n").splitlines()
+    if not lines:
+        return False, "gprof produced an empty report."
+    # The flat profile starts with a few header lines, then one row per function.
+    header = next((i for i, line in enumerate(lines) if line.strip().startswith("time")), None)
+    if header is None:
+        return True, "\n".join(lines[:limit])
+    # Keep the whole header (title, units and the two column-title lines).
+    return True, "\n".join(lines[:header + 1 + limit])
@@ -1,14 +1,82 @@
 import subprocess
+import asyncio
 import os
 import tempfile
 import shutil
 import uuid
 import sys
+import time
+import signal
+import threading
+from core.profiling import summarize_pstats, summarize_jfr, summarize_gprof
 
 # Platform-specific flag to prevent console window from appearing on Windows
 CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
 
+# Every execution gets its own process group (a new session on POSIX), so that
+# killing it also kills any processes it spawned.
+if sys.platform == 'win32':
+    GROUP_KWARGS = {'creationflags': CREATION_FLAGS | subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    GROUP_KWARGS = {'start_new_session': True}
+
+CANCELLED_MESSAGE = "Cancelled"
+
+def kill_tree(pid):
+    """Kills the process `pid` together with every process in its group."""
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True, creationflags=CREATION_FLAGS)
+        else:
+            os.killpg(pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+def _kill_leftovers(pid):
+    # After the main process has exited, kill anything it left running in its
+    # group. On Windows this would cost a taskkill spawn per run, so it is only
+    # done on POSIX, where it is a single syscall.
+    if sys.platform != 'win32':
+        kill_tree(pid)
+
+class ProcessSet:
+    """A set of running executions that can be killed together.
+
+    Once `kill` has been called, executions that register later are killed
+    immediately, so a cancelled set never leaves stragglers behind.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pids = set()
+        self.killed = False
+
+    def add(self, pid):
+        with self._lock:
+            self._pids.add(pid)
+            killed = self.killed
+        if killed:
+            kill_tree(pid)
+
+    def discard(self, pid):
+        with self._lock:
+            self._pids.discard(pid)
+
+    def kill(self):
+        with self._lock:
+            self.killed = True
+            pids = list(self._pids)
+        for pid in pids:
+            kill_tree(pid)
+
 class Runner:
+    # Message returned when the program (or its interpreter) cannot be launched.
+    NOT_FOUND_MESSAGE = "Executable not found"
+    # File extension of the raw profile written by `profile`.
+    PROFILE_EXTENSION = ".prof"
+    # Seconds a profiled run gets to write its profile after being interrupted.
+    PROFILE_GRACE = 2
+
     def __init__(self, code, language, timeout):
         self.code = code
         self.language = language
@@ -16,19 +84,162 @@ class Runner:
         self.executable = None
         self.source_file = None
         self.timeout = timeout
+        # All executions of this runner, so that they can be killed on stop.
+        self.processes = ProcessSet()
 
     def compile(self):
         pass
 
-    def run(self, input_str):
-        pass
+    def kill(self):
+        """Kills every running execution of this runner, including child processes."""
+        self.processes.kill()
+
+    def _execute(self, argv, input_str, timeout=None, processes=None, cwd=None, interrupt_grace=None):
+        """Runs `argv` in its own process group and returns (stdout, stderr, returncode).
+
+        On timeout the whole process tree is killed. With `interrupt_grace`, the
+        program is first interrupted (SIGINT, POSIX only) and given that many
+        seconds to exit cleanly, e.g. so that a profiler can write its data. If
+        the execution is killed through `self.processes` or `processes`, stderr
+        is CANCELLED_MESSAGE.
+        """
+        sets = [self.processes] + ([processes] if processes is not None else [])
+        process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=cwd,
+            **GROUP_KWARGS
+        )
+        for process_set in sets:
+            process_set.add(process.pid)
+        try:
+            try:
+                stdout, stderr = process.communicate(input_str, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                if interrupt_grace and sys.platform != 'win32':
+                    process.send_signal(signal.SIGINT)
+                    try:
+                        process.communicate(timeout=interrupt_grace)
+                    except subprocess.TimeoutExpired:
+                        pass
+                kill_tree(process.pid)
+                process.kill()
+                process.communicate()
+                return "", "Timeout", -1
+        finally:
+            for process_set in sets:
+                process_set.discard(process.pid)
+            if process.returncode is not None:
+                _kill_leftovers(process.pid)
+        if process.returncode != 0 and any(process_set.killed for process_set in sets):
+            return "", CANCELLED_MESSAGE, -1
+        return stdout, stderr, process.returncode
+
+    def command(self):
+        """Returns the argv used to execute the compiled program."""
+        return []
+
+    def run(self, input_str, args=(), processes=None, timeout=None):
+        """Runs the program on `input_str` and returns (stdout, stderr, returncode).
+
+        `processes` is an optional extra ProcessSet that the execution joins, so
+        that callers can cancel a group of related executions. `timeout`
+        overrides `self.timeout` for this execution.
+        """
+        try:
+            return self._execute(self.command() + list(args), input_str, timeout or self.timeout, processes)
+        except FileNotFoundError:
+            return "", self.NOT_FOUND_MESSAGE, -1
+        except Exception as e:
+            return "", str(e), -1
+
+    def run_timed(self, input_str, args=(), processes=None, timeout=None):
+        """Like `run`, but also returns the wall-clock time of the execution."""
+        start = time.perf_counter()
+        stdout, stderr, returncode = self.run(input_str, args, processes, timeout)
+        return stdout, stderr, returncode, time.perf_counter() - start
+
+    def profile(self, input_str, profile_path, args=(), timeout=None):
+        """Re-runs the program on `input_str` under a profiler.
+
+        The raw profile is written to `profile_path`. Returns (success, text),
+        where text is a summary of the functions with the most self time, or
+        the reason profiling failed. A run that times out is interrupted so
+        that the profile of what it did so far is still written.
+        """
+        return False, f"Profiling is not supported for {self.language}."
+
+    def _run_profiled(self, argv, input_str, timeout, cwd=None):
+        try:
+            return self._execute(argv, input_str, timeout or self.timeout, cwd=cwd, interrupt_grace=self.PROFILE_GRACE)
+        except FileNotFoundError:
+            return "", self.NOT_FOUND_MESSAGE, -1
+        except Exception as e:
+            return "", str(e), -1
+
+    async def run_async(self, input_str, args=(), processes=None, timeout=None):
+        """Runs the program on an asyncio event loop.
+
+        Returns the same (stdout, stderr, returncode) tuple as `run`. If the
+        awaiting task is cancelled, the child process is killed before the
+        cancellation propagates.
+        """
+        # The spawn is shielded so that a cancellation arriving while the child is
+        # starting still leaves us with a process handle to kill.
+        spawn = asyncio.ensure_future(asyncio.create_subprocess_exec(
+            *self.command(), *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **GROUP_KWARGS
+        ))
+        try:
+            process = await asyncio.shield(spawn)
+        except asyncio.CancelledError:
+            await _wait_uncancellable(spawn)
+            if not spawn.cancelled() and spawn.exception() is None:
+                await _kill_async(spawn.result())
+            raise
+        except FileNotFoundError:
+            return "", self.NOT_FOUND_MESSAGE, -1
+        except Exception as e:
+            return "", str(e), -1
+
+        sets = [self.processes] + ([processes] if processes is not None else [])
+        for process_set in sets:
+            process_set.add(process.pid)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(input_str.encode()), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            await _kill_async(process)
+            return "", "Timeout", -1
+        except asyncio.CancelledError:
+            await _kill_async(process)
+            raise
+        finally:
+            for process_set in sets:
+                process_set.discard(process.pid)
+        _kill_leftovers(process.pid)
+        if process.returncode != 0 and any(process_set.killed for process_set in sets):
+            return "", CANCELLED_MESSAGE, -1
+        return _decode(stdout), _decode(stderr), process.returncode
 
     def cleanup(self):
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
 class PythonRunner(Runner):
-    def __init__(self, code, language, timeout):
+    NOT_FOUND_MESSAGE = "Python executable not found. Please ensure Python is installed and in your PATH."
+    DEFAULT_INTERPRETER = "python"
+    # Placeholder resolved by the tester to the fastest available interpreter.
+    AUTO_INTERPRETER = "auto"
+
+    def __init__(self, code, language, timeout, interpreter=None):
         super().__init__(code, language, timeout)
+        # Name or path of the interpreter, e.g. "python", "pypy3" or "/usr/bin/python3.11".
+        self.interpreter = interpreter or self.DEFAULT_INTERPRETER
 
     def compile(self):
         self.source_file = os.path.join(self.temp_dir, "script.py")
@@ -36,23 +247,20 @@ class PythonRunner(Runner):
             f.write(self.code)
         return True, "Compilation successful"
 
-    def run(self, input_str):
-        try:
-            process = subprocess.run(
-                ["python", self.source_file],
-                input=input_str,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                creationflags=CREATION_FLAGS
-            )
-            return process.stdout, process.stderr, process.returncode
-        except FileNotFoundError:
-            return "", "Python executable not found. Please ensure Python is installed and in your PATH.", -1
-        except subprocess.TimeoutExpired:
-            return "", "Timeout", -1
-        except Exception as e:
-            return "", str(e), -1
+    def command(self):
+        interpreter = self.interpreter
+        if interpreter == self.AUTO_INTERPRETER:
+            interpreter = self.DEFAULT_INTERPRETER
+        return [interpreter, self.source_file]
+
+    def profile(self, input_str, profile_path, args=(), timeout=None):
+        # cProfile writes its output even when the script is interrupted.
+        argv = self.command()
+        argv[1:1] = ["-m", "cProfile", "-o", profile_path]
+        _, stderr, _ = self._run_profiled(argv + list(args), input_str, timeout)
+        if not os.path.exists(profile_path):
+            return False, f"cProfile wrote no profile:\n{stderr}"
+        return summarize_pstats(profile_path)
 
 class CppRunner(Runner):
     def __init__(self, code, language, timeout):
@@ -65,38 +273,69 @@ class CppRunner(Runner):
             f.write(self.code)
         
         try:
-            process = subprocess.run(
-                ["g++", self.source_file, "-o", self.executable],
-                capture_output=True,
-                text=True,
-                creationflags=CREATION_FLAGS
-            )
+            _, stderr, returncode = self._execute(["g++", self.source_file, "-o", self.executable], "")
         except FileNotFoundError:
             return False, "g++ compiler not found. Please install MinGW-w64 and add it to your system's PATH."
 
-        if process.returncode != 0:
-            return False, process.stderr
+        if returncode != 0:
+            return False, stderr
         return True, "Compilation successful"
 
-    def run(self, input_str):
+    def command(self):
+        return [self.executable]
+
+    def run(self, input_str, args=(), processes=None, timeout=None):
         if not os.path.exists(self.executable):
             return "", "Executable not found", -1
+        return super().run(input_str, args, processes, timeout)
+
+    # Makes an interrupted program exit normally, so that gmon.out is written.
+    PROFILE_HOOK = """#include <csignal>
+#include <cstdlib>
+static void stress_tester_on_interrupt(int) { std::exit(130); }
+static int stress_tester_hook = (std::signal(SIGINT, stress_tester_on_interrupt), 0);
+"""
+
+    def _compile_instrumented(self):
+        """Builds a gprof-instrumented copy of the program once. Returns (success, message)."""
+        executable = os.path.join(self.temp_dir, "main_pg.exe")
+        if os.path.exists(executable):
+            return True, executable
+        hook_file = os.path.join(self.temp_dir, "profile_hook.cpp")
+        with open(hook_file, "w", encoding="utf-8") as f:
+            f.write(self.PROFILE_HOOK)
         try:
-            process = subprocess.run(
-                [self.executable],
-                input=input_str,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                creationflags=CREATION_FLAGS
-            )
-            return process.stdout, process.stderr, process.returncode
-        except subprocess.TimeoutExpired:
-            return "", "Timeout", -1
-        except Exception as e:
-            return "", str(e), -1
+            _, stderr, returncode = self._execute(["g++", "-pg", self.source_file, hook_file, "-o", executable], "")
+        except FileNotFoundError:
+            return False, "g++ compiler not found."
+        if returncode != 0:
+            return False, f"Instrumented build failed:\n{stderr}"
+        return True, executable
+
+    def profile(self, input_str, profile_path, args=(), timeout=None):
+        if shutil.which("gprof") is None:
+            return False, "gprof not found. Install binutils to profile C++ solutions."
+        success, executable = self._compile_instrumented()
+        if not success:
+            return False, executable
+        # gmon.out is written to the working directory.
+        work_dir = tempfile.mkdtemp(dir=self.temp_dir)
+        _, stderr, _ = self._run_profiled([executable] + list(args), input_str, timeout, cwd=work_dir)
+        gmon = os.path.join(work_dir, "gmon.out")
+        if not os.path.exists(gmon):
+            return False, f"The instrumented program wrote no gmon.out:\n{stderr}"
+        shutil.move(gmon, profile_path)
+        try:
+            report, stderr, returncode = self._execute(["gprof", "-b", "-p", executable, profile_path], "")
+        except FileNotFoundError:
+            return False, "gprof not found. Install binutils to profile C++ solutions."
+        if returncode != 0:
+            return False, f"gprof failed:\n{stderr}"
+        return summarize_gprof(report)
 
 class JavaRunner(Runner):
+    NOT_FOUND_MESSAGE = "Java runtime not found. Please install a JRE/JDK and add it to your system's PATH."
+
     def __init__(self, code, language, timeout):
         super().__init__(code, language, timeout)
 
@@ -109,40 +348,73 @@ class JavaRunner(Runner):
             f.write(self.code)
         
         try:
-            process = subprocess.run(
-                ["javac", self.source_file],
-                capture_output=True,
-                text=True,
-                creationflags=CREATION_FLAGS
-            )
+            _, stderr, returncode = self._execute(["javac", self.source_file], "")
         except FileNotFoundError:
             return False, "javac compiler not found. Please install a JDK and add it to your system's PATH."
-        if process.returncode != 0:
-            return False, process.stderr
+        if returncode != 0:
+            return False, stderr
         return True, "Compilation successful"
 
-    def run(self, input_str):
+    def command(self):
         # java -cp temp_dir Main
+        return ["java", "-cp", self.temp_dir, "Main"]
+
+    PROFILE_EXTENSION = ".jfr"
+
+    def profile(self, input_str, profile_path, args=(), timeout=None):
+        # The recording is dumped by a shutdown hook, which also runs on SIGINT.
+        argv = self.command()
+        argv[1:1] = [f"-XX:StartFlightRecording=filename={profile_path},settings=profile,dumponexit=true"]
+        _, stderr, _ = self._run_profiled(argv + list(args), input_str, timeout)
+        if not os.path.exists(profile_path):
+            return False, f"Flight Recorder wrote no recording:\n{stderr}"
+        if shutil.which("jfr") is None:
+            return False, "The jfr tool was not found; the recording was saved but not summarized."
         try:
-            process = subprocess.run(
-                ["java", "-cp", self.temp_dir, "Main"],
-                input=input_str,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                creationflags=CREATION_FLAGS
+            report, stderr, returncode = self._execute(
+                ["jfr", "print", "--json", "--events", "jdk.ExecutionSample", profile_path], ""
             )
-            return process.stdout, process.stderr, process.returncode
         except FileNotFoundError:
-            return "", "Java runtime not found. Please install a JRE/JDK and add it to your system's PATH.", -1
-        except subprocess.TimeoutExpired:
-            return "", "Timeout", -1
-        except Exception as e:
-            return "", str(e), -1
+            return False, "The jfr tool was not found; the recording was saved but not summarized."
+        if returncode != 0:
+            return False, f"jfr print failed:\n{stderr}"
+        return summarize_jfr(report)
+
+def _decode(data):
+    # Mirror subprocess.run(text=True), which also normalizes newlines.
+    text = data.decode(errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+async def _wait_uncancellable(future):
+    """Waits for `future` to finish, even across cancellations of the caller.
+
+    Returns True if the caller was cancelled while waiting.
+    """
+    cancelled = False
+    while not future.done():
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled = True
+        except Exception:
+            pass
+    return cancelled
+
+async def _kill_async(process):
+    kill_tree(process.pid)
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+    # Reap the child even if we are cancelled again while waiting, otherwise its
+    # transport outlives the event loop.
+    if await _wait_uncancellable(asyncio.ensure_future(process.communicate())):
+        raise asyncio.CancelledError()
 
-def get_runner(language, code, timeout):
+def get_runner(language, code, timeout, interpreter=None):
+    # `interpreter` only applies to Python and is ignored for compiled languages.
     if language == "python":
-        return PythonRunner(code, language, timeout)
+        return PythonRunner(code, language, timeout, interpreter)
     elif language == "cpp":
         return CppRunner(code, language, timeout)
     elif language == "java":
@@ -2,17 +2,123 @@ import threading
 import queue
 import time
 import difflib
-from core.runner import get_runner
+import os
+import random
+from core.runner import get_runner, ProcessSet, PythonRunner, CANCELLED_MESSAGE
+from core.cache import OutputCache
+from core.checkpoint import CaseProgress, TimingStats, SessionCheckpoint, fingerprint
+from core.metrics import CaseLog
+from core.probe import available_interpreters, probe_interpreters, fastest_interpreter, format_probe
+
+VERDICT_OK = "OK"
+VERDICT_WA = "WA"
+VERDICT_RE = "RE"
+VERDICT_TLE = "TLE"
+VERDICTS = [VERDICT_OK, VERDICT_WA, VERDICT_RE, VERDICT_TLE]
 
 class StressTester:
-    def __init__(self, code_a, lang_a, code_b, lang_b, code_c, lang_c, log_queue, timeout):
-        self.runner_a = get_runner(lang_a, code_a, timeout)
-        self.runner_b = get_runner(lang_b, code_b, timeout)
-        self.runner_c = get_runner(lang_c, code_c, timeout)
+    """Compares candidate solutions against a reference solution B.
+
+    C is the first candidate. Further candidates can be given as a list of
+    (code, language) pairs in `candidates`; they are named D, E, ..., Z (at most 23). Every
+    generated input is shared by the reference and all candidates, which run
+    concurrently. A candidate that fails is retired and its verdicts are kept
+    in `results`; the test stops once no candidate is left (or B fails).
+
+    With `cache_size` > 0, the reference output of recent inputs is memoized so
+    that a repeated input does not run B again. With `dedupe`, an input on which
+    every candidate already passed is skipped entirely.
+
+    `interpreters` maps program names ("A", "B", "C", ...) to the Python
+    interpreter used for them. "auto" picks the fastest available interpreter
+    by probing the program on a few generated inputs after compilation.
+
+    With a `calibrator` (see core.calibration), each program's timeout is
+    derived from its measured runtimes once it has warmed up. The configured
+    timeout (or the calibrator's ceiling, e.g. the judge limit) remains the
+    upper bound. A run killed by a tighter calibrated timeout is re-run once
+    with CONFIRMATION_FACTOR times that timeout (at most the upper bound)
+    before it is reported as a TLE, so heavy cases still pass while hung ones
+    are killed quickly.
+
+    With a `profile_dir`, programs that time out, as well as the slowest
+    successful run of each solution, are re-run under a profiler when the test
+    ends (unless it was stopped by the user). The input, the raw profile and a
+    summary are saved to `profile_dir`, and the summary is logged after a
+    `_PROFILE_::` marker.
+
+    With a `checkpoint` path, the session state (seed cursor, finished cases,
+    timing statistics and the slowest runs) is appended to that file every
+    CHECKPOINT_INTERVAL seconds and when the test ends. Checkpointed sessions
+    are always seeded. With `resume`, the session continues from the last
+    checkpoint in the file, skipping every case it already covered. A new
+    checkpointed session without a `seed_start` gets a random one, which is
+    kept in the checkpoint.
+
+    `metrics` (a core.metrics.Metrics, usually shared with a MetricsServer)
+    receives case counts, verdicts and run times. With a `case_log` path, one
+    JSON record per finished case is appended to that file in the background.
+    """
+
+    PROBE_SAMPLES = 3
+    CHECKPOINT_INTERVAL = 10.0
+    CONFIRMATION_FACTOR = 4
+    # Extra candidates are named D to Z.
+    MAX_EXTRA_CANDIDATES = 23
+
+    def __init__(self, code_a, lang_a, code_b, lang_b, code_c, lang_c, log_queue, timeout, max_cases=None, seed_start=None,
+                 candidates=(), cache_size=0, dedupe=False, interpreters=None, calibrator=None,
+                 profile_dir=None, checkpoint=None, resume=False,
+                 metrics=None, case_log=None):
+        if len(candidates) > self.MAX_EXTRA_CANDIDATES:
+            raise ValueError(f"At most {self.MAX_EXTRA_CANDIDATES} extra candidates (D to Z) are supported.")
+        self.interpreters = dict(interpreters or {})
+        self.runner_a = get_runner(lang_a, code_a, timeout, self.interpreters.get("A"))
+        self.runner_b = get_runner(lang_b, code_b, timeout, self.interpreters.get("B"))
+        self.runner_c = get_runner(lang_c, code_c, timeout, self.interpreters.get("C"))
+        self.candidates = [("C", self.runner_c)]
+        for i, (code, lang) in enumerate(candidates):
+            name = chr(ord("D") + i)
+            self.candidates.append((name, get_runner(lang, code, timeout, self.interpreters.get(name))))
+        self.active_candidates = [name for name, _ in self.candidates]
+        # Verdict counts per candidate, and the case where each one first failed.
+        self.results = {name: {verdict: 0 for verdict in VERDICTS} for name, _ in self.candidates}
+        self.first_failures = {}
+        self._results_lock = threading.Lock()
+        self.output_cache = OutputCache(cache_size) if cache_size > 0 else None
+        self.dedupe = dedupe
+        self.skipped_duplicates = 0
+        self.calibrator = calibrator
+        if calibrator is not None and calibrator.ceiling is None:
+            calibrator.ceiling = timeout
+        self.profile_dir = profile_dir
+        # Slowest successful run of each solution: name -> (elapsed, input).
+        self.slowest_runs = {}
+        self._profile_requests = []
         self.log_queue = log_queue
         self.running = False
+        self.stopped_by_user = False
         self.thread = None
         self.timeout = timeout
+        self.max_cases = max_cases
+        self.case_count = 0
+        # When set, case N runs the generator with the seed `seed_start + N - 1`
+        # as its first command-line argument, so every case can be reproduced.
+        self.seed_start = seed_start
+        self.progress = CaseProgress()
+        self.stats = TimingStats()
+        self.fingerprint = fingerprint([[runner.code, runner.language] for _, runner in self._all_runners()])
+        self.metrics = metrics
+        self.case_log = CaseLog(case_log) if case_log else None
+        self.checkpoint = None
+        if checkpoint is not None:
+            self.checkpoint = SessionCheckpoint(checkpoint, self.CHECKPOINT_INTERVAL, append=resume)
+            if resume:
+                self._restore(self.checkpoint.load())
+            if self.seed_start is None:
+                # A new session must not replay the inputs of the previous one.
+                self.seed_start = random_seed_start()
+                self._log(f"New session with seed start {self.seed_start}.")
 
     def start(self):
         if self.running:
@@ -22,82 +128,475 @@ class StressTester:
         self.thread.start()
 
     def stop(self):
+        """Stops the test, killing every running execution and its child processes."""
         self.running = False
-        if self.thread:
+        self.stopped_by_user = True
+        self._kill_all()
+        if self.thread and self.thread is not threading.current_thread():
             self.thread.join()
 
+    def _all_runners(self):
+        return [("A", self.runner_a), ("B", self.runner_b)] + self.candidates
+
+    def _kill_all(self):
+        for _, runner in self._all_runners():
+            runner.kill()
+
     def _log(self, message):
         self.log_queue.put(message)
 
-    def _run_loop(self):
-        self._log("Starting stress test...")
-        
-        # Compile all
-        runners = [("A", self.runner_a), ("B", self.runner_b), ("C", self.runner_c)]
-        for name, runner in runners:
+    def _compile_all(self):
+        for name, runner in self._all_runners():
             self._log(f"Compiling {name}...")
             success, msg = runner.compile()
             if not success:
-                self._log(f"Compilation failed for {name}:\n{msg}")
-                self.running = False
-                return
-        
-        self._log("Compilation successful. Running tests...")
-        
-        case_count = 0
-        while self.running:
-            case_count += 1
-            # Run A to generate input
-            input_str, stderr, ret = self.runner_a.run("")
-            if ret != 0:
-                self._log(f"Generator A failed (Case {case_count}):\nError:\n{stderr}\n(No input for generator)")
+                # A compiler killed by stop() is not worth reporting.
+                if self.running:
+                    self._log(f"Compilation failed for {name}:\n{msg}")
                 self.running = False
-                break
-            
-            # --- Parallel execution for B and C ---
-            results = {}
-            def run_and_store(runner_name, runner, input_str):
-                out, err, ret = runner.run(input_str)
-                results[runner_name] = (out, err, ret)
+                return False
+        self._resolve_auto_interpreters()
+        return True
 
-            thread_b = threading.Thread(target=run_and_store, args=('B', self.runner_b, input_str))
-            thread_c = threading.Thread(target=run_and_store, args=('C', self.runner_c, input_str))
+    def _resolve_auto_interpreters(self):
+        auto = [
+            (name, runner) for name, runner in self._all_runners()
+            if getattr(runner, "interpreter", None) == PythonRunner.AUTO_INTERPRETER
+        ]
+        if not auto:
+            return
+        interpreters = available_interpreters()
+        generator_args = [self._generator_args(i + 1) for i in range(self.PROBE_SAMPLES)]
+        inputs = []
+        for argv in generator_args:
+            input_str, _, ret = self.runner_a.run("", argv)
+            if ret == 0:
+                inputs.append(input_str)
+        for name, runner in auto:
+            if name == "A":
+                # The generator is probed with the arguments of the first cases.
+                timings = probe_interpreters(runner.code, [""] * len(generator_args), interpreters, self.timeout,
+                                             generator_args)
+            else:
+                timings = probe_interpreters(runner.code, inputs, interpreters, self.timeout)
+            runner.interpreter = fastest_interpreter(timings) or PythonRunner.DEFAULT_INTERPRETER
+            self._log(f"Interpreter probe for {name}:\n{format_probe(timings)}\nUsing {runner.interpreter} for {name}.")
 
-            thread_b.start()
-            thread_c.start()
+    def _reached_case_limit(self):
+        return self.max_cases is not None and self.case_count >= self.max_cases
 
-            thread_b.join()
-            thread_c.join()
+    def _generator_args(self, case_count):
+        if self.seed_start is None:
+            return ()
+        return (str(self.seed_start + case_count - 1),)
 
-            out_b, err_b, ret_b = results['B']
-            out_c, err_c, ret_c = results['C']
-            # --- End of parallel execution ---
+    def _generator_failure_messages(self, case_count, stderr):
+        return [f"Generator A failed (Case {case_count}):\nError:\n{stderr}\n(No input for generator)"]
 
-            if ret_b != 0:
-                self._log(f"Solution B failed (Case {case_count}):\nError:\n{err_b}")
-                self._log(f"Input:\n---\n{input_str.strip()}\n---")
-                self._log(f"_INPUT_::{input_str.strip()}")
-                self.running = False
-                break
+    def _active_runners(self):
+        with self._results_lock:
+            active = set(self.active_candidates)
+        return [(name, runner) for name, runner in self.candidates if name in active]
 
-            if ret_c != 0:
-                self._log(f"Solution C failed (Case {case_count}):\nInput:\n---\n{input_str.strip()}\n---\nError:\n{err_c}")
-                self._log(f"_INPUT_::{input_str.strip()}")
-                self.running = False
-                break
+    def _kills_siblings(self, name):
+        """Whether a failure of `name` makes the other runs of the case pointless."""
+        return name == "B" or len(self.active_candidates) <= 1
+
+    def _reference_failure_messages(self, case_count, input_str, result_b):
+        out_b, err_b, ret_b = result_b[:3]
+        return [
+            f"Solution B failed (Case {case_count}):\nError:\n{err_b}",
+            f"Input:\n---\n{input_str.strip()}\n---",
+            f"_INPUT_::{input_str.strip()}",
+        ]
+
+    def _candidate_verdict(self, case_count, input_str, name, result_b, result):
+        """Returns (verdict, messages) for one candidate.
+
+        The verdict is None if the run was cancelled, since a run killed because
+        a sibling failed (or the test was stopped) says nothing about itself.
+        """
+        out_b = result_b[0]
+        out, err, ret = result[:3]
+
+        if ret != 0:
+            if err == CANCELLED_MESSAGE:
+                return None, []
+            return VERDICT_TLE if err == "Timeout" else VERDICT_RE, [
+                f"Solution {name} failed (Case {case_count}):\nInput:\n---\n{input_str.strip()}\n---\nError:\n{err}",
+                f"_INPUT_::{input_str.strip()}",
+            ]
+
+        # Compare
+        if out_b.strip() != out.strip():
+            label = "" if len(self.candidates) == 1 else f" (Solution {name})"
+            diff_text = _generate_side_by_side_diff(out_b, out, label2="Solution 2 (C)" if name == "C" else f"Solution {name}")
+            messages = [
+                f"Discrepancy found at Case {case_count}{label}!",
+                "_DISCREPANCY_START_",
+            ]
+            if name != "C":
+                messages.append(f"_CANDIDATE_::{name}")
+            messages += [
+                f"_INPUT_::{input_str.strip()}",
+                f"_OUTPUT_B_::{out_b.strip()}",
+                f"_OUTPUT_C_::{out.strip()}",
+                f"_DIFF_::{diff_text}",
+                "_DISCREPANCY_END_",
+            ]
+            return VERDICT_WA, messages
+
+        return VERDICT_OK, []
+
+    def _judge(self, case_count, input_str, result_b, candidate_results):
+        """Judges every candidate against the reference.
+
+        `candidate_results` maps candidate names to their (stdout, stderr,
+        returncode, ...) results. Returns (messages, verdicts): the log messages
+        describing failures keyed by the name of the failing program, and the
+        verdict of each candidate. If the reference itself failed, verdicts is
+        None.
+        """
+        reference_cancelled = result_b[2] != 0 and result_b[1] == CANCELLED_MESSAGE
+        if result_b[2] != 0 and not reference_cancelled:
+            return {"B": self._reference_failure_messages(case_count, input_str, result_b)}, None
+
+        messages = {}
+        verdicts = {}
+        for name, result in candidate_results.items():
+            if reference_cancelled and result[2] == 0:
+                # Nothing to compare against; only crashes and timeouts count.
+                verdicts[name] = None
+                continue
+            verdict, candidate_messages = self._candidate_verdict(case_count, input_str, name, result_b, result)
+            verdicts[name] = verdict
+            if candidate_messages:
+                messages[name] = candidate_messages
+        return messages, verdicts
+
+    def _finish_case(self, case_count, messages, verdicts, times=None, worker="local", input_str=None,
+                     reference_verdict=None):
+        """Records and logs the outcome of a case. Returns False if the test should stop.
+
+        Only the first failure of each candidate is reported; later failures of
+        a retired candidate (from cases that were already in flight) are dropped.
+        `times` maps program names to their run times in the case, and `worker`
+        names where the case ran (for metrics). `input_str` and the verdict of
+        B (`reference_verdict`, None unless B failed) select the runs to profile.
+        """
+        self._record_progress(case_count, times)
+        self._observe_case(case_count, verdicts, times or {}, worker)
+        if verdicts is None:
+            for name_messages in messages.values():
+                for message in name_messages:
+                    self._log(message)
+            if reference_verdict == VERDICT_TLE:
+                self._request_profile("B", case_count, input_str)
+            if self.metrics is not None:
+                for name in messages:
+                    self.metrics.record_fatal_error(name)
+            return False
+
+        with self._results_lock:
+            retired = []
+            for name, verdict in verdicts.items():
+                if verdict is None or name not in self.active_candidates:
+                    continue
+                self.results[name][verdict] += 1
+                if self.metrics is not None:
+                    self.metrics.record_verdict(name, verdict)
+                if verdict != VERDICT_OK:
+                    retired.append(name)
+                    self.first_failures[name] = case_count
+            for name in retired:
+                self.active_candidates.remove(name)
+            remaining = list(self.active_candidates)
+
+        for name in retired:
+            for message in messages.get(name, []):
+                self._log(message)
+            if verdicts[name] == VERDICT_TLE:
+                self._request_profile(name, case_count, input_str)
+        if retired and remaining:
+            self._log(f"Solution {', '.join(retired)} retired. Remaining: {', '.join(remaining)}")
+        return bool(remaining)
+
+    def results_matrix(self):
+        """Returns the per-candidate verdict counts as a text table."""
+        header = "Solution".ljust(10) + "".join(v.rjust(8) for v in VERDICTS) + "  First failure"
+        lines = [header, "-" * len(header)]
+        for name, _ in self.candidates:
+            counts = self.results[name]
+            first = self.first_failures.get(name)
+            lines.append(
+                name.ljust(10) + "".join(str(counts[v]).rjust(8) for v in VERDICTS)
+                + "  " + (f"Case {first}" if first is not None else "-")
+            )
+        return "\n".join(lines)
+
+    def _run_case(self, case_count):
+        """Generates and judges a single case.
+
+        Returns (messages, times, verdicts, input_str, reference_verdict):
+        messages and verdicts as produced by `_judge`, the wall-clock time of
+        each program keyed by its name, the generated input (None if there is
+        none) and the verdict of B (None unless B failed).
+        """
+        input_str, stderr, ret, time_a = self._run_program("A", self.runner_a, "", self._generator_args(case_count))
+        if ret != 0:
+            if stderr == CANCELLED_MESSAGE:
+                return {}, {'A': time_a}, {}, None, None
+            return {"A": self._generator_failure_messages(case_count, stderr)}, {'A': time_a}, None, None, None
+
+        key, cached = self._lookup_reference(input_str)
+        if cached is not None and self.dedupe and cached[1]:
+            return {}, {'A': time_a}, {}, input_str, None
 
-            # Compare
-            if out_b.strip() != out_c.strip():
-                self._log(f"Discrepancy found at Case {case_count}!")
-                self._log("_DISCREPANCY_START_")
-                self._log(f"_INPUT_::{input_str.strip()}")
-                self._log(f"_OUTPUT_B_::{out_b.strip()}")
-                self._log(f"_OUTPUT_C_::{out_c.strip()}")
-                
-                diff_text = _generate_side_by_side_diff(out_b, out_c)
-                self._log(f"_DIFF_::{diff_text}")
-                self._log("_DISCREPANCY_END_")
+        # --- Parallel execution for B and the candidates ---
+        # All runs share a process set so that a fatal failure kills the others.
+        results = {}
+        siblings = ProcessSet()
+        def run_and_store(runner_name, runner, input_str):
+            results[runner_name] = self._run_program(runner_name, runner, input_str, processes=siblings)
+            if results[runner_name][2] != 0 and self._kills_siblings(runner_name):
+                siblings.kill()
 
+        runners = self._active_runners()
+        if cached is None:
+            runners = [("B", self.runner_b)] + runners
+        threads = [
+            threading.Thread(target=run_and_store, args=(name, runner, input_str))
+            for name, runner in runners
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # --- End of parallel execution ---
+
+        times = {'A': time_a}
+        times.update({name: result[3] for name, result in results.items()})
+        result_b = results.pop("B") if cached is None else cached[0]
+        messages, verdicts = self._judge(case_count, input_str, result_b, results)
+        self._remember_reference(key, result_b, verdicts)
+        return messages, times, verdicts, input_str, reference_verdict(result_b)
+
+    def _run_program(self, name, runner, input_str, args=(), processes=None):
+        """Runs one program and feeds its runtime to the calibrator, if any.
+
+        Returns (stdout, stderr, returncode, elapsed).
+        """
+        result = runner.run_timed(input_str, args, processes)
+        if self._needs_confirmation(runner, result):
+            result = runner.run_timed(input_str, args, processes, self._confirmation_timeout(runner))
+        self._calibrate(name, runner, result)
+        self._track_slowest(name, input_str, result)
+        return result
+
+    def _needs_confirmation(self, runner, result):
+        # A calibrated timeout may be too tight for a genuinely heavy case, so a
+        # TLE is only trusted once the program also exceeds a larger budget.
+        return (
+            self.calibrator is not None and result[2] != 0 and result[1] == "Timeout"
+            and runner.timeout < self.calibrator.ceiling
+        )
+
+    def _confirmation_timeout(self, runner):
+        return min(self.calibrator.ceiling, self.CONFIRMATION_FACTOR * runner.timeout)
+
+    def _calibrate(self, name, runner, result):
+        if self.calibrator is None or result[2] != 0:
+            return
+        previous = runner.timeout
+        timeout = self.calibrator.record(name, result[3])
+        if timeout is None:
+            return
+        runner.timeout = timeout
+        if abs(timeout - previous) > 0.2 * previous:
+            self._log(f"Timeout for {name} calibrated to {timeout:.3f}s.")
+
+    def _track_slowest(self, name, input_str, result):
+        if self.profile_dir is None or name == "A" or result[2] != 0:
+            return
+        with self._results_lock:
+            slowest = self.slowest_runs.get(name)
+            if slowest is None or result[3] > slowest[0]:
+                self.slowest_runs[name] = (result[3], input_str)
+
+    def _request_profile(self, name, case_count, input_str):
+        if self.profile_dir is None or input_str is None:
+            return
+        self._profile_requests.append((name, input_str, f"case{case_count}_tle", f"TLE at Case {case_count}"))
+
+    def _profile_pending(self):
+        """Profiles the timed-out runs and the slowest run of each solution."""
+        if self.profile_dir is None:
+            return
+        requests = list(self._profile_requests)
+        profiled = {name for name, *_ in requests}
+        for name, (elapsed, input_str) in sorted(self.slowest_runs.items()):
+            if name not in profiled:
+                requests.append((name, input_str, "slowest", f"slowest run, {elapsed:.3f}s"))
+        self._profile_requests = []
+        if not requests:
+            return
+        if self.stopped_by_user:
+            self._log("Stopped by user; profiling skipped.")
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        runners = dict(self._all_runners())
+        ceiling = self.calibrator.ceiling if self.calibrator is not None else self.timeout
+        for name, input_str, tag, description in requests:
+            runner = runners[name]
+            self._log(f"Profiling {name} ({description})...")
+            if runner.source_file is None:
+                # Distributed tests compile on the workers only.
+                success, msg = runner.compile()
+                if not success:
+                    self._log(f"Could not compile {name} for profiling:\n{msg}")
+                    continue
+            base = os.path.join(self.profile_dir, f"{name}_{tag}")
+            with open(base + ".in", "w", encoding="utf-8") as f:
+                f.write(input_str)
+            success, summary = runner.profile(input_str, base + runner.PROFILE_EXTENSION, timeout=ceiling)
+            if not success:
+                self._log(f"Profiling {name} failed: {summary}")
+                continue
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(summary + "\n")
+            self._log(f"Profile of {name} saved to {base}{runner.PROFILE_EXTENSION}")
+            self._log(f"_PROFILE_::Solution {name} ({description}):\n{summary}")
+
+    def _next_case(self):
+        """Allocates the next case number, skipping cases covered before a resume."""
+        with self._results_lock:
+            self.case_count += 1
+            while self.progress.is_done(self.case_count):
+                self.case_count += 1
+            self.progress.start(self.case_count)
+            return self.case_count
+
+    def _record_progress(self, case_count, times=None):
+        with self._results_lock:
+            self.progress.finish(case_count)
+            if times:
+                self.stats.record(case_count, times)
+        if self.checkpoint is not None and self.checkpoint.due():
+            self._write_checkpoint()
+
+    def _observe_case(self, case_count, verdicts, times, worker):
+        if self.metrics is not None:
+            self.metrics.record_case(times, worker)
+            self.metrics.set_gauge("log_queue_depth", self.log_queue.qsize())
+            self.metrics.set_gauge("cases_in_flight", len(self.progress.pending))
+        if self.case_log is not None:
+            record = {"case": case_count, "verdicts": verdicts, "times": times, "worker": worker, "time": time.time()}
+            if self.seed_start is not None:
+                record["seed"] = self.seed_start + case_count - 1
+            self.case_log.write(record)
+
+    def _end_session(self):
+        """Saves the final checkpoint, flushes the case log and runs pending profiles."""
+        self._write_checkpoint()
+        if self.case_log is not None:
+            self.case_log.close()
+        self._profile_pending()
+
+    def _write_checkpoint(self):
+        if self.checkpoint is None:
+            return
+        with self._results_lock:
+            state = {
+                "fingerprint": self.fingerprint,
+                "seed_start": self.seed_start,
+                "covered": self.progress.covered,
+                "done": sorted(self.progress.done),
+                "pending": sorted(self.progress.pending),
+                "case_count": self.progress.count(),
+                "stats": self.stats.to_dict(),
+                "results": {name: dict(counts) for name, counts in self.results.items()},
+                "first_failures": dict(self.first_failures),
+            }
+        try:
+            self.checkpoint.write(state)
+        except OSError as e:
+            self._log(f"Could not write checkpoint: {e}")
+
+    def _restore(self, state):
+        if state is None:
+            self._log("No checkpoint found; starting a new session.")
+            return
+        if state["fingerprint"] != self.fingerprint:
+            self._log("Warning: the sources changed since the checkpoint was written.")
+        self.seed_start = state["seed_start"]
+        self.progress = CaseProgress(state["covered"], state["done"])
+        self.stats = TimingStats.from_dict(state["stats"])
+        # Every candidate is tested again, but the verdict counts carry over.
+        for name, counts in state["results"].items():
+            if name in self.results:
+                self.results[name].update(counts)
+        self.first_failures.update({
+            name: case for name, case in state["first_failures"].items() if name in self.results
+        })
+        self._log(
+            f"Resuming session: {self.progress.count()} cases covered, "
+            f"continuing after case {self.progress.covered} (seed start {self.seed_start})."
+        )
+
+    def _lookup_reference(self, input_str):
+        """Returns (key, cached) where cached is the (result_b, known_good) entry or None.
+
+        A known-good hit with deduplication on counts as a skipped duplicate.
+        """
+        if self.output_cache is None:
+            return None, None
+        key = OutputCache.key(input_str)
+        cached = self.output_cache.get(key)
+        if cached is not None and self.dedupe and cached[1]:
+            with self._results_lock:
+                self.skipped_duplicates += 1
+        return key, cached
+
+    def _remember_reference(self, key, result_b, verdicts):
+        if key is None or result_b[2] != 0 or verdicts is None:
+            return
+        known_good = bool(verdicts) and all(v == VERDICT_OK for v in verdicts.values())
+        self.output_cache.put(key, tuple(result_b[:3]), known_good)
+
+    def _cleanup(self):
+        for _, runner in self._all_runners():
+            runner.cleanup()
+
+    def _log_results_matrix(self):
+        if len(self.candidates) > 1:
+            self._log("Results matrix:\n" + self.results_matrix())
+        if self.output_cache is not None:
+            self._log(
+                f"Reference cache: {self.output_cache.hits} hits, {self.output_cache.misses} misses, "
+                f"{self.skipped_duplicates} duplicate cases skipped."
+            )
+
+    def _run_loop(self):
+        self._log("Starting stress test...")
+        
+        # Compile all
+        if not self._compile_all():
+            return
+        
+        self._log("Compilation successful. Running tests...")
+        
+        self.case_count = self.progress.covered
+        while self.running:
+            if self._reached_case_limit():
+                self._log(f"Reached the case limit ({self.max_cases}).")
+                self.running = False
+                break
+            case_count = self._next_case()
+            messages, times, verdicts, input_str, verdict_b = self._run_case(case_count)
+            if not self.running:
+                break
+            if not self._finish_case(case_count, messages, verdicts, times, input_str=input_str,
+                                     reference_verdict=verdict_b):
                 self.running = False
                 break
             
@@ -108,14 +607,25 @@ class StressTester:
             # But maybe don't spam too hard.
             # time.sleep(0.01) 
 
+        self._end_session()
+        self._log_results_matrix()
         self._log("Stress test stopped.")
         
         # Cleanup
-        self.runner_a.cleanup()
-        self.runner_b.cleanup()
-        self.runner_c.cleanup()
+        self._cleanup()
+
+def random_seed_start():
+    """Returns a random first seed, so that separate sessions test different inputs."""
+    return random.getrandbits(31)
+
+def reference_verdict(result_b):
+    """Returns the verdict of a failed reference run, or None if it passed or was cancelled."""
+    out_b, err_b, ret_b = result_b[:3]
+    if ret_b == 0 or err_b == CANCELLED_MESSAGE:
+        return None
+    return VERDICT_TLE if err_b == "Timeout" else VERDICT_RE
 
-def _generate_side_by_side_diff(s1, s2, width=80):
+def _generate_side_by_side_diff(s1, s2, width=80, label1="Solution 1 (B)", label2="Solution 2 (C)"):
     """
     Generates a simplified side-by-side diff view.
     """
@@ -127,7 +637,7 @@ def _generate_side_by_side_diff(s1, s2, width=80):
     lines = []
     half_width = width // 2 - 2  # -2 for separator
 
-    lines.append("Solution 1 (B)".ljust(half_width) + " | " + "Solution 2 (C)".ljust(half_width))
+    lines.append(label1.ljust(half_width) + " | " + label2.ljust(half_width))
     lines.append("-" * (half_width) + "-+-" + "-" * (half_width))
 
     i = 0
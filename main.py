@@ -1,3 +1,4 @@
+import multiprocessing
 import customtkinter as ctk
 from ui.app import StressTesterApp
 
@@ -9,4 +10,6 @@ def main():
     app.mainloop()
 
 if __name__ == "__main__":
+    # Needed by the engine process when the app is frozen into an executable.
+    multiprocessing.freeze_support()
     main()
@@ -8,6 +8,33 @@ import threading
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from core.tester import StressTester
+from core.async_engine import AsyncStressTester
+from core.distributed import WorkerDaemon, DistributedStressTester, main as distributed_main
+from core.enumeration import EnumerationTester
+
+def _drain(log_queue):
+    """Prints and returns every message left in `log_queue`."""
+    messages = []
+    while not log_queue.empty():
+        messages.append(log_queue.get_nowait())
+    for msg in messages:
+        print(f"LOG: {msg}")
+    return messages
+
+def _process_alive(pid):
+    """Whether `pid` is running; a zombie waiting to be reaped counts as dead."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    if not os.path.isdir("/proc"):
+        return True
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        # Exited between the two checks.
+        return False
 
 def test_logic():
     print("Starting logic test...")
@@ -96,7 +123,725 @@ print(sys.stdin.read().strip())
     if not tle_detected:
         print("TEST FAILED: TLE for Solution B not detected within timeout.")
 
+def test_async_engine():
+    print("Starting async engine test...")
+
+    code_a = """
+import random
+print(random.randint(1, 10))
+"""
+    code_b = """
+import sys
+print(int(sys.stdin.read().strip()))
+"""
+    # C: Wrong for n > 5 (Should fail)
+    code_c = """
+import sys
+n = int(sys.stdin.read().strip())
+print(n + 1 if n > 5 else n)
+"""
+    log_queue = queue.Queue()
+    tester = AsyncStressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5, concurrency=4)
+
+    tester.start()
+
+    start_time = time.time()
+    found = False
+    while time.time() - start_time < 10 and not found:
+        try:
+            msg = log_queue.get(timeout=0.1)
+            print(f"LOG: {msg}")
+            found = "Discrepancy found" in msg
+        except queue.Empty:
+            continue
+
+    tester.stop()
+    assert found, "No discrepancy found within timeout."
+    assert not tester.running
+
+    # A generator failure is recorded like any other fatal case
+    from core.metrics import Metrics
+    metrics = Metrics()
+    log_queue = queue.Queue()
+    tester = AsyncStressTester("raise SystemExit(1)", "python", code_b, "python", code_c, "python", log_queue,
+                               timeout=5, concurrency=1, metrics=metrics)
+    tester.start()
+    tester.thread.join(timeout=30)
+    messages = _drain(log_queue)
+    assert any(msg.startswith("Generator A failed (Case 1)") for msg in messages)
+    assert metrics.fatal_errors == {"A": 1}
+    assert metrics.cases == 1
+    assert tester.progress.count() == 1
+
+    # An unexpected exception while running a case is reported and ends the test
+    log_queue = queue.Queue()
+    tester = AsyncStressTester(code_a, "python", code_b, "python", code_c, "python", log_queue,
+                               timeout=5, concurrency=4)
+    run_sibling = tester._run_sibling
+    async def broken_sibling(name, runner, input_str, siblings):
+        if name == "C":
+            raise RuntimeError("broken sibling")
+        return await run_sibling(name, runner, input_str, siblings)
+    tester._run_sibling = broken_sibling
+    tester.start()
+    tester.thread.join(timeout=30)
+    messages = _drain(log_queue)
+    assert not tester.running
+    assert any(msg.startswith("Error: Running C failed") and "broken sibling" in msg for msg in messages)
+    print("TEST PASSED: Async engine found the discrepancy.")
+
+def test_distributed():
+    print("Starting distributed test...")
+
+    # A: Uses the seed it receives so failures are reproducible
+    code_a = """
+import random, sys
+random.seed(int(sys.argv[1]))
+print(random.randint(1, 10))
+"""
+    code_b = """
+import sys
+print(int(sys.stdin.read().strip()))
+"""
+    code_c = """
+import sys
+n = int(sys.stdin.read().strip())
+print(n + 1 if n > 5 else n)
+"""
+    daemons = [WorkerDaemon("127.0.0.1:0", jobs=2, token="secret") for _ in range(2)]
+    for daemon in daemons:
+        daemon.start()
+
+    # A wrong token is rejected before anything runs
+    log_queue = queue.Queue()
+    tester = DistributedStressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5,
+                                     workers=[daemons[0].address], token="wrong")
+    tester.start()
+    tester.thread.join(timeout=15)
+    logs = _drain(log_queue)
+    assert any("rejected the session" in msg and "Invalid token" in msg for msg in logs), "Wrong token was accepted."
+    assert not any("Discrepancy found" in msg for msg in logs)
+
+    # Binding beyond loopback requires a token
+    try:
+        distributed_main(["--listen", "0.0.0.0:0"])
+        raise AssertionError("The daemon started on a public address without a token.")
+    except SystemExit as e:
+        assert e.code != 0
+
+    log_queue = queue.Queue()
+    tester = DistributedStressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5,
+                                     workers=[daemon.address for daemon in daemons], batch_size=4, token="secret")
+    tester.start()
+
+    start_time = time.time()
+    found = False
+    while time.time() - start_time < 15 and not found:
+        try:
+            msg = log_queue.get(timeout=0.1)
+            print(f"LOG: {msg}")
+            found = "Discrepancy found" in msg
+        except queue.Empty:
+            continue
+
+    tester.stop()
+    for daemon in daemons:
+        daemon.shutdown()
+    assert found, "No discrepancy found by the workers within timeout."
+    print("TEST PASSED: Workers found the discrepancy.")
+
+def test_stop_kills_process_tree():
+    print("Starting stop latency test...")
+
+    import tempfile
+    pid_file = os.path.join(tempfile.mkdtemp(), "grandchild.pid")
+
+    code_a = """
+print(1)
+"""
+    # B: Starts a grandchild that outlives it, then hangs
+    code_b = f"""
+import subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+with open({pid_file!r}, "w") as f:
+    f.write(str(child.pid))
+time.sleep(30)
+"""
+    code_c = """
+import sys
+print(sys.stdin.read().strip())
+"""
+    log_queue = queue.Queue()
+    tester = StressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=30)
+    tester.start()
+
+    start_time = time.time()
+    while not os.path.exists(pid_file) and time.time() - start_time < 10:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    assert os.path.exists(pid_file), "Solution B never started."
+
+    stop_start = time.time()
+    tester.stop()
+    stop_latency = time.time() - stop_start
+    print(f"Stop took {stop_latency * 1000:.1f} ms")
+    assert stop_latency < 0.1, f"Stop took {stop_latency:.2f}s"
+
+    if sys.platform != "win32":
+        with open(pid_file) as f:
+            grandchild = int(f.read())
+        deadline = time.time() + 2
+        while _process_alive(grandchild) and time.time() < deadline:
+            time.sleep(0.05)
+        assert not _process_alive(grandchild), "Grandchild process survived stop()."
+
+    messages = _drain(log_queue)
+    assert not any("failed" in msg for msg in messages), "Stop was reported as a failure."
+    print("TEST PASSED: Stop killed the whole process tree quickly.")
+
+def test_n_way():
+    print("Starting N-way comparison test...")
+
+    code_a = """
+import random
+print(random.randint(1, 10))
+"""
+    # B: Reference
+    code_b = """
+import sys
+print(int(sys.stdin.read().strip()))
+"""
+    # C: Correct candidate
+    code_c = code_b
+    # D: Wrong for n > 5
+    code_d = """
+import sys
+n = int(sys.stdin.read().strip())
+print(n + 1 if n > 5 else n)
+"""
+    # E: Always crashes
+    code_e = """
+raise SystemExit(3)
+"""
+    log_queue = queue.Queue()
+    tester = StressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5, max_cases=30,
+                          candidates=[(code_d, "python"), (code_e, "python")])
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    messages = _drain(log_queue)
+
+    assert tester.results["C"]["OK"] == 30
+    assert tester.results["D"]["WA"] == 1
+    assert tester.results["E"]["RE"] == 1
+    assert tester.first_failures["E"] == 1
+    assert "C" not in tester.first_failures
+    assert any(msg.startswith("Results matrix:") for msg in messages)
+
+    # Extra candidates are named D to Z, so there can be at most 23 of them
+    try:
+        StressTester(code_a, "python", code_b, "python", code_c, "python", queue.Queue(), timeout=5,
+                     candidates=[(code_d, "python")] * (StressTester.MAX_EXTRA_CANDIDATES + 1))
+        raise AssertionError("Too many candidates were accepted.")
+    except ValueError as e:
+        print(f"Rejected: {e}")
+    print("TEST PASSED: Per-candidate verdicts recorded.")
+
+def test_reference_cache():
+    print("Starting reference cache test...")
+
+    # A: Only three possible inputs
+    code_a = """
+import random
+print(random.randint(1, 3))
+"""
+    code_b = """
+import sys
+print(int(sys.stdin.read().strip()) * 2)
+"""
+    code_c = code_b
+    log_queue = queue.Queue()
+    tester = StressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5, max_cases=40,
+                          cache_size=16, dedupe=True)
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    _drain(log_queue)
+
+    assert tester.case_count == 40
+    assert tester.output_cache.misses <= 3
+    assert tester.skipped_duplicates >= 37
+
+    # Skipped duplicates still count as finished cases in the async engine
+    from core.metrics import Metrics
+    metrics = Metrics()
+    log_queue = queue.Queue()
+    tester = AsyncStressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5, max_cases=40,
+                               cache_size=16, dedupe=True, concurrency=4, metrics=metrics)
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    _drain(log_queue)
+
+    assert tester.skipped_duplicates >= 30
+    assert metrics.cases == 40
+    assert tester.progress.count() == 40
+    print("TEST PASSED: Repeated inputs were skipped.")
+
+def test_enumeration():
+    print("Starting enumeration test...")
+
+    # A: The index-th input is the index itself
+    code_a = """
+import sys
+print(sys.argv[1])
+"""
+    code_b = """
+import sys
+print(int(sys.stdin.read().strip()))
+"""
+    # C: Wrong on exactly two inputs
+    code_c = """
+import sys
+n = int(sys.stdin.read().strip())
+print(n + 1 if n in (37, 45) else n)
+"""
+    log_queue = queue.Queue()
+    tester = EnumerationTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5,
+                               total=50, shards=4)
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    messages = _drain(log_queue)
+
+    assert tester.first_failing_index == 37
+    assert "Discrepancy found at Case 38!" in messages
+    assert any(msg.startswith("Covered ") for msg in messages)
+
+    # A retired candidate does not end the enumeration for the others
+    code_wrong_at_5 = """
+import sys
+n = int(sys.stdin.read().strip())
+print(n + 1 if n == 5 else n)
+"""
+    log_queue = queue.Queue()
+    tester = EnumerationTester(code_a, "python", code_b, "python", code_wrong_at_5, "python", log_queue, timeout=5,
+                               total=30, shards=4, candidates=[(code_b, "python")])
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    messages = _drain(log_queue)
+
+    assert tester.first_failing_index == 5
+    assert tester.first_failures == {"C": 6}
+    assert tester.results["D"]["OK"] == 30
+    assert tester.covered == 30
+    assert "Enumeration complete: D passed all 30 inputs." in messages
+
+    # After a resume, the ETA only uses the rate of the current session
+    import tempfile
+    from core.checkpoint import SessionCheckpoint
+    path = os.path.join(tempfile.mkdtemp(), "checkpoint.jsonl")
+    SessionCheckpoint(path).write({
+        "fingerprint": tester.fingerprint, "seed_start": 0, "covered": 50, "done": [],
+        "stats": {}, "results": {}, "first_failures": {},
+    })
+    resumed = EnumerationTester(code_a, "python", code_b, "python", code_c, "python", queue.Queue(), timeout=5,
+                                total=100, checkpoint=path, resume=True)
+    assert resumed.covered == 50
+    # 10 cases in 10 seconds leaves 40 seconds for the remaining 40
+    assert resumed.progress_text(60, 10.0) == "Covered 60/100 (60.0%), ETA 00:40"
+    print("TEST PASSED: Smallest failing index reported.")
+
+def test_interpreters():
+    print("Starting interpreter test...")
+
+    from core.probe import probe_interpreters, fastest_interpreter
+
+    code = """
+import sys
+print(sys.stdin.read().strip())
+"""
+    timings = probe_interpreters(code, ["1", "2"], [sys.executable, "no-such-python"], timeout=5)
+    assert timings["no-such-python"] is None
+    assert fastest_interpreter(timings) == sys.executable
+
+    # A generator that needs its seed only works when probed with arguments
+    generator = """
+import sys
+print(int(sys.argv[1]))
+"""
+    assert probe_interpreters(generator, [""], [sys.executable], timeout=5)[sys.executable] is None
+    timings = probe_interpreters(generator, ["", ""], [sys.executable], timeout=5, args=[("1",), ("2",)])
+    assert timings[sys.executable] is not None
+
+    log_queue = queue.Queue()
+    tester = StressTester("print(1)", "python", code, "python", code, "python", log_queue, timeout=5, max_cases=3,
+                          interpreters={"B": "auto", "C": sys.executable})
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    messages = _drain(log_queue)
+
+    assert any(msg.startswith("Interpreter probe for B") for msg in messages)
+    assert tester.runner_b.interpreter != "auto"
+    assert tester.runner_c.command()[0] == sys.executable
+    assert tester.case_count == 3
+    print("TEST PASSED: Interpreters resolved.")
+
+def test_timeout_calibration():
+    print("Starting timeout calibration test...")
+
+    from core.calibration import TimeoutCalibrator
+
+    code_a = """
+import sys
+print(sys.argv[1])
+"""
+    code_b = """
+print(input())
+"""
+    # C is a few times slower on one case after calibration; it must still pass.
+    code_c = """
+import time
+n = int(input())
+if n == 15:
+    time.sleep(0.2)
+print(n)
+"""
+    log_queue = queue.Queue()
+    calibrator = TimeoutCalibrator(warmup=5, recalibrate_every=5)
+    tester = StressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=5,
+                          max_cases=20, seed_start=0, calibrator=calibrator)
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    messages = _drain(log_queue)
+
+    assert calibrator.ceiling == 5
+    assert calibrator.is_calibrated("B") and calibrator.is_calibrated("C")
+    assert tester.runner_b.timeout < 5
+    assert not any(msg.startswith("_DISCREPANCY_START_") for msg in messages)
+    assert tester.case_count == 20
+
+    # A hung run is reported within the confirmation budget, long before the ceiling.
+    code_hung = """
+n = int(input())
+while n == 15:
+    pass
+print(n)
+"""
+    log_queue = queue.Queue()
+    calibrator = TimeoutCalibrator(warmup=5, recalibrate_every=5)
+    tester = StressTester(code_a, "python", code_b, "python", code_hung, "python", log_queue, timeout=10,
+                          max_cases=20, seed_start=0, calibrator=calibrator)
+    start_time = time.time()
+    tester.start()
+    tester.thread.join(timeout=60)
+    elapsed = time.time() - start_time
+    messages = _drain(log_queue)
+
+    budget = (1 + StressTester.CONFIRMATION_FACTOR) * tester.runner_c.timeout
+    print(f"Session took {elapsed:.2f}s; calibrated budget for the hung case {budget:.2f}s")
+    assert tester.results["C"]["TLE"] == 1 and tester.first_failures["C"] == 16
+    assert elapsed < budget + 2, f"Hung case took too long to report ({elapsed:.2f}s)"
+    print("TEST PASSED: Timeouts calibrated without false TLEs; hung cases killed quickly.")
+
+def test_profile_on_timeout():
+    print("Starting profiling test...")
+
+    import tempfile
+    profile_dir = tempfile.mkdtemp()
+
+    # A: Trailing whitespace that the displayed input strips
+    code_a = """
+import sys
+print(sys.argv[1] + "  ")
+"""
+    code_b = """
+print(input().strip())
+"""
+    code_c = """
+def spin():
+    while True:
+        pass
+
+n = int(input())
+if n == 3:
+    spin()
+print(n)
+"""
+    log_queue = queue.Queue()
+    tester = StressTester(code_a, "python", code_b, "python", code_c, "python", log_queue, timeout=1,
+                          max_cases=10, seed_start=0, profile_dir=profile_dir)
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    messages = _drain(log_queue)
+
+    profiles = [msg for msg in messages if msg.startswith("_PROFILE_::")]
+    assert any("Solution C (TLE at Case 4)" in msg and "spin" in msg for msg in profiles)
+    assert any("Solution B (slowest run" in msg for msg in profiles)
+    files = sorted(os.listdir(profile_dir))
+    assert {"C_case4_tle.in", "C_case4_tle.prof", "C_case4_tle.txt", "B_slowest.in"} <= set(files), files
+    # The profile runs on exactly the bytes that timed out
+    with open(os.path.join(profile_dir, "C_case4_tle.in"), newline="") as f:
+        assert f.read() == "3  \n"
+    print("TEST PASSED: Timed-out run profiled.")
+
+def test_checkpoint_resume():
+    print("Starting checkpoint test...")
+
+    import tempfile
+    from core.checkpoint import CaseProgress
+
+    progress = CaseProgress()
+    for case in [2, 3, 1, 5]:
+        progress.finish(case)
+    assert progress.covered == 3 and progress.is_done(5) and not progress.is_done(4)
+
+    work_dir = tempfile.mkdtemp()
+    seeds_file = os.path.join(work_dir, "seeds.txt")
+    checkpoint = os.path.join(work_dir, "session.jsonl")
+    # A: Records every seed it is run with
+    code_a = f"""
+import sys
+with open({seeds_file!r}, "a") as f:
+    f.write(sys.argv[1] + "\\n")
+print(sys.argv[1])
+"""
+    code_b = """
+print(input())
+"""
+
+    def run(max_cases, resume):
+        log_queue = queue.Queue()
+        tester = StressTester(code_a, "python", code_b, "python", code_b, "python", log_queue, timeout=5,
+                              max_cases=max_cases, checkpoint=checkpoint, resume=resume)
+        tester.start()
+        tester.thread.join(timeout=60)
+        messages = _drain(log_queue)
+        return tester, messages
+
+    first, _ = run(12, resume=False)
+    tester, messages = run(20, resume=True)
+    assert any(msg.startswith("Resuming session: 12 cases covered") for msg in messages)
+    assert tester.seed_start == first.seed_start
+    with open(seeds_file) as f:
+        seeds = [int(line) for line in f]
+    assert sorted(seeds) == list(range(first.seed_start, first.seed_start + 20)), seeds
+
+    # A new session starts from a different random seed.
+    other, _ = run(1, resume=False)
+    assert other.seed_start != first.seed_start
+    assert tester.results["C"]["OK"] == 20
+    assert tester.stats.to_dict()["programs"]["B"]["count"] == 20
+    print("TEST PASSED: Resumed session covered every case exactly once.")
+
+def test_metrics_endpoint():
+    print("Starting metrics test...")
+
+    import json
+    import tempfile
+    import urllib.request
+    from core.metrics import Metrics, MetricsServer
+
+    metrics = Metrics()
+    server = MetricsServer(metrics)
+    server.start()
+    case_log = os.path.join(tempfile.mkdtemp(), "cases.jsonl")
+
+    code_a = """
+import sys
+print(sys.argv[1])
+"""
+    code_b = """
+print(input())
+"""
+    log_queue = queue.Queue()
+    tester = StressTester(code_a, "python", code_b, "python", code_b, "python", log_queue, timeout=5,
+                          max_cases=10, seed_start=100, metrics=metrics, case_log=case_log)
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            text = response.read().decode()
+    finally:
+        server.shutdown()
+    print(text)
+
+    assert "stress_cases_total 10" in text.splitlines()
+    assert 'stress_verdicts_total{solution="C",verdict="OK"} 10' in text
+    assert 'stress_run_seconds_bucket{program="B",le="+Inf"} 10' in text
+    assert 'stress_worker_busy_seconds_total{worker="local"}' in text
+    with open(case_log) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["seed"] for record in records] == list(range(100, 110))
+    assert all(record["verdicts"] == {"C": "OK"} for record in records)
+    print("TEST PASSED: Metrics scraped and cases logged.")
+
+def test_process_engine():
+    print("Starting process engine test...")
+
+    from core.process_engine import ProcessStressTester
+    from core.metrics import Metrics
+
+    code_a = """
+import random
+print(random.randint(1, 10))
+"""
+    code_b = """
+print(int(input()))
+"""
+    code_c = """
+n = int(input())
+print(n + 1 if n > 5 else n)
+"""
+    log_queue = queue.Queue()
+    metrics = Metrics()
+    tester = ProcessStressTester("thread", code_a, "python", code_b, "python", code_c, "python", log_queue,
+                                 timeout=5, metrics=metrics)
+    tester.start()
+    tester.thread.join(timeout=60)
+
+    messages = _drain(log_queue)
+
+    assert not tester.running and not tester.process.is_alive()
+    assert any(msg.startswith("Discrepancy found") for msg in messages)
+    assert messages[-1] == "Stress test stopped."
+    assert tester.status["results"]["C"]["WA"] == 1
+    assert metrics.verdicts[("C", "WA")] == 1
+    assert metrics.cases == tester.status["covered"]
+
+    # An endless run stops on request.
+    tester = ProcessStressTester("async", code_a, "python", code_b, "python", code_b, "python", log_queue,
+                                 timeout=5, concurrency=2)
+    tester.start()
+    time.sleep(2)
+    tester.request_status()
+    time.sleep(0.5)
+    assert tester.status.get("running")
+    tester.stop()
+    tester.thread.join(timeout=15)
+    assert not tester.running and not tester.process.is_alive()
+    print("TEST PASSED: Engine ran in a child process.")
+
+def test_process_engine_stop_latency():
+    print("Starting process engine stop latency test...")
+
+    from core.process_engine import ProcessStressTester
+    import tempfile
+    pid_file = os.path.join(tempfile.mkdtemp(), "grandchild.pid")
+
+    code_a = """
+print(1)
+"""
+    # B: Starts a grandchild that outlives it, then hangs
+    code_b = f"""
+import subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+with open({pid_file!r}, "w") as f:
+    f.write(str(child.pid))
+time.sleep(30)
+"""
+    log_queue = queue.Queue()
+    tester = ProcessStressTester("thread", code_a, "python", code_b, "python", code_a, "python", log_queue, timeout=30)
+    tester.start()
+
+    start_time = time.time()
+    while not os.path.exists(pid_file) and time.time() - start_time < 15:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    assert os.path.exists(pid_file), "Solution B never started."
+    with open(pid_file) as f:
+        grandchild = int(f.read())
+
+    stop_start = time.time()
+    tester.stop()
+    call_latency = time.time() - stop_start
+    alive = True
+    while alive and time.time() - stop_start < 2:
+        alive = _process_alive(grandchild)
+        if alive:
+            time.sleep(0.005)
+    kill_latency = time.time() - stop_start
+    print(f"stop() returned after {call_latency * 1000:.1f} ms, tree killed after {kill_latency * 1000:.1f} ms")
+    assert call_latency < 0.05, f"stop() blocked for {call_latency:.3f}s"
+    assert not alive, "Grandchild process survived stop()."
+    assert kill_latency < 0.1, f"Killing the tree took {kill_latency:.3f}s"
+
+    tester.thread.join(timeout=15)
+    assert not tester.running and not tester.process.is_alive()
+    print("TEST PASSED: Stopping the engine process is fast and non-blocking.")
+
+def test_benchmark_compare():
+    print("Starting benchmark comparison test...")
+
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+    from bench_runners import compare
+
+    baseline = {
+        "python/16": {"throughput": 100.0, "overhead_ms": 10.0},
+        "python/65536": {"throughput": 50.0, "overhead_ms": 12.0},
+        "cpp/16": {"throughput": 200.0, "overhead_ms": 1.0},
+        "loop/thread": {"throughput": 80.0},
+        "python/1048576": {"throughput": 10.0, "overhead_ms": -1.83, "overhead_noise_ms": 3.0},
+    }
+    results = {
+        # Within the tolerance
+        "python/16": {"throughput": 90.0, "overhead_ms": 11.0},
+        # Throughput dropped by 40% and overhead grew by 50%
+        "python/65536": {"throughput": 30.0, "overhead_ms": 18.0},
+        # 100% more overhead, but only 0.3ms: scheduler noise
+        "cpp/16": {"throughput": 200.0, "overhead_ms": 1.3},
+        "loop/thread": {"throughput": 60.0},
+        # More overhead than the baseline, but within the measured noise
+        "python/1048576": {"throughput": 10.0, "overhead_ms": 0.42, "overhead_noise_ms": 2.5},
+        # Not in the baseline
+        "java/16": {"throughput": 1.0, "overhead_ms": 500.0},
+    }
+    regressions = compare(results, baseline)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+
+    assert len(regressions) == 3
+    assert any(r.startswith("python/65536: throughput") for r in regressions)
+    assert any(r.startswith("python/65536: overhead") for r in regressions)
+    assert any(r.startswith("loop/thread: throughput") for r in regressions)
+    assert compare(results, baseline, tolerance=0.6) == []
+    print("TEST PASSED: Regressions detected against the baseline.")
+
 if __name__ == "__main__":
     test_logic()
     print("\n")
     test_tle()
+    print("\n")
+    test_async_engine()
+    print("\n")
+    test_distributed()
+    print("\n")
+    test_stop_kills_process_tree()
+    print("\n")
+    test_n_way()
+    print("\n")
+    test_reference_cache()
+    print("\n")
+    test_enumeration()
+    print("\n")
+    test_interpreters()
+    print("\n")
+    test_timeout_calibration()
+    print("\n")
+    test_profile_on_timeout()
+    print("\n")
+    test_checkpoint_resume()
+    print("\n")
+    test_metrics_endpoint()
+    print("\n")
+    test_process_engine()
+    print("\n")
+    test_process_engine_stop_latency()
+    print("\n")
+    test_benchmark_compare()
@@ -1,10 +1,27 @@
 import customtkinter as ctk
+from tkinter import filedialog
 from ui.editor import CodeEditor
 import queue
 import json
+import os
+from core.process_engine import ProcessStressTester
 from core.tester import StressTester
+from core.probe import available_interpreters, probe_interpreters, format_probe
+from core.runner import get_runner
+from core.calibration import TimeoutCalibrator
+from core.metrics import Metrics, MetricsServer
+import threading
 
 class StressTesterApp(ctk.CTk):
+    REFERENCE_CACHE_SIZE = 100000
+    PROFILE_DIR = "profiles"
+    CHECKPOINT_FILE = os.path.join(os.path.expanduser("~"), ".stress_tester", "session_checkpoint.jsonl")
+    CASE_LOG_FILE = "case_log.jsonl"
+    METRICS_PORT = 9464
+    PROBE_SAMPLES = 5
+    # Source file extensions of extra candidates.
+    CANDIDATE_LANGUAGES = {".py": "python", ".cpp": "cpp", ".cc": "cpp", ".cxx": "cpp", ".java": "java"}
+
     TEMPLATES = {
         'generator': {
             'python': """import random
@@ -130,46 +147,120 @@ public class Main {
         # Editors
         lang_a = self.settings['languages'].get('editor_a', 'python')
         code_a = self.settings['codes'].get('editor_a')
-        self.editor_a = CodeEditor(self, title="Generator (A)", language=lang_a, templates=self.TEMPLATES['generator'])
+        interpreter_a = self.settings.get('interpreters', {}).get('editor_a', 'python')
+        self.editor_a = CodeEditor(self, title="Generator (A)", language=lang_a, templates=self.TEMPLATES['generator'], interpreter=interpreter_a)
         if code_a:
             self.editor_a.set_code(code_a)
         self.editor_a.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
 
         lang_b = self.settings['languages'].get('editor_b', 'python')
         code_b = self.settings['codes'].get('editor_b')
-        self.editor_b = CodeEditor(self, title="Solution 1 (B)", language=lang_b, templates=self.TEMPLATES['solution'])
+        interpreter_b = self.settings.get('interpreters', {}).get('editor_b', 'python')
+        self.editor_b = CodeEditor(self, title="Solution 1 (B)", language=lang_b, templates=self.TEMPLATES['solution'], interpreter=interpreter_b)
         if code_b:
             self.editor_b.set_code(code_b)
         self.editor_b.grid(row=0, column=1, padx=5, pady=5, sticky="nsew")
 
         lang_c = self.settings['languages'].get('editor_c', 'python')
         code_c = self.settings['codes'].get('editor_c')
-        self.editor_c = CodeEditor(self, title="Solution 2 (C)", language=lang_c, templates=self.TEMPLATES['solution'])
+        interpreter_c = self.settings.get('interpreters', {}).get('editor_c', 'python')
+        self.editor_c = CodeEditor(self, title="Solution 2 (C)", language=lang_c, templates=self.TEMPLATES['solution'], interpreter=interpreter_c)
         if code_c:
             self.editor_c.set_code(code_c)
         self.editor_c.grid(row=0, column=2, padx=5, pady=5, sticky="nsew")
 
-        # Controls
+        # Controls: running the test, engine settings, and options, one row each
+        # so that nothing is clipped at the default window width.
         self.control_frame = ctk.CTkFrame(self)
         self.control_frame.grid(row=1, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
-
-        self.start_button = ctk.CTkButton(self.control_frame, text="Start Stress Test", command=self.start_test, fg_color="green")
+        self.run_frame = ctk.CTkFrame(self.control_frame, fg_color="transparent")
+        self.run_frame.pack(side="top", fill="x")
+        self.engine_frame = ctk.CTkFrame(self.control_frame, fg_color="transparent")
+        self.engine_frame.pack(side="top", fill="x")
+        self.options_frame = ctk.CTkFrame(self.control_frame, fg_color="transparent")
+        self.options_frame.pack(side="top", fill="x")
+
+        self.start_button = ctk.CTkButton(self.run_frame, text="Start Stress Test", command=self.start_test, fg_color="green")
         self.start_button.pack(side="left", padx=10, pady=10)
 
-        self.stop_button = ctk.CTkButton(self.control_frame, text="Stop", command=self.stop_test, fg_color="red", state="disabled")
+        self.stop_button = ctk.CTkButton(self.run_frame, text="Stop", command=self.stop_test, fg_color="red", state="disabled")
         self.stop_button.pack(side="left", padx=10, pady=10)
+
+        self.copy_input_button = ctk.CTkButton(self.run_frame, text="Copy Input", command=self.copy_last_input, state="disabled")
+        self.copy_input_button.pack(side="left", padx=10, pady=10)
         
-        self.status_label = ctk.CTkLabel(self.control_frame, text="Ready")
+        self.status_label = ctk.CTkLabel(self.run_frame, text="Ready")
         self.status_label.pack(side="left", padx=20)
 
-        self.timeout_label = ctk.CTkLabel(self.control_frame, text="Timeout (seconds):")
+        self.timeout_label = ctk.CTkLabel(self.run_frame, text="Timeout (seconds):")
         self.timeout_label.pack(side="left", padx=(20, 5), pady=10)
-        self.timeout_entry = ctk.CTkEntry(self.control_frame, width=70)
+        self.timeout_entry = ctk.CTkEntry(self.run_frame, width=70)
         self.timeout_entry.insert(0, "2")
         self.timeout_entry.pack(side="left", padx=(0, 10), pady=10)
 
-        self.copy_input_button = ctk.CTkButton(self.control_frame, text="Copy Input", command=self.copy_last_input, state="disabled")
-        self.copy_input_button.pack(side="left", padx=10, pady=10)
+        self.engine_var = ctk.StringVar(value=self.settings.get('engine', 'thread'))
+        self.engine_menu = ctk.CTkOptionMenu(self.engine_frame, variable=self.engine_var, values=["thread", "async", "distributed", "enumerate"], width=110)
+        self.engine_menu.pack(side="left", padx=(10, 5), pady=10)
+        self.concurrency_label = ctk.CTkLabel(self.engine_frame, text="Parallel:")
+        self.concurrency_label.pack(side="left", padx=(5, 5), pady=10)
+        self.concurrency_entry = ctk.CTkEntry(self.engine_frame, width=50)
+        self.concurrency_entry.insert(0, str(self.settings.get('concurrency', 8)))
+        self.concurrency_entry.pack(side="left", padx=(0, 10), pady=10)
+        self.total_label = ctk.CTkLabel(self.engine_frame, text="Total:")
+        self.total_label.pack(side="left", padx=(5, 5), pady=10)
+        self.total_entry = ctk.CTkEntry(self.engine_frame, width=70, placeholder_text="inputs")
+        if self.settings.get('total'):
+            self.total_entry.insert(0, self.settings['total'])
+        self.total_entry.pack(side="left", padx=(0, 10), pady=10)
+        self.workers_label = ctk.CTkLabel(self.engine_frame, text="Workers:")
+        self.workers_label.pack(side="left", padx=(5, 5), pady=10)
+        self.workers_entry = ctk.CTkEntry(self.engine_frame, width=160, placeholder_text="host:port, ...")
+        if self.settings.get('workers'):
+            self.workers_entry.insert(0, self.settings['workers'])
+        self.workers_entry.pack(side="left", padx=(0, 10), pady=10)
+        # The worker token is a secret, so it is not saved with the settings.
+        self.token_entry = ctk.CTkEntry(self.engine_frame, width=90, placeholder_text="token", show="*")
+        self.token_entry.pack(side="left", padx=(0, 10), pady=10)
+
+        self.probe_button = ctk.CTkButton(self.engine_frame, text="Probe Interpreters", command=self.probe_interpreters, width=130)
+        self.probe_button.pack(side="left", padx=10, pady=10)
+
+        self.cache_var = ctk.BooleanVar(value=self.settings.get('cache', False))
+        self.cache_checkbox = ctk.CTkCheckBox(self.options_frame, text="Cache B", variable=self.cache_var, width=80)
+        self.cache_checkbox.pack(side="left", padx=5, pady=10)
+        self.dedupe_var = ctk.BooleanVar(value=self.settings.get('dedupe', False))
+        self.dedupe_checkbox = ctk.CTkCheckBox(self.options_frame, text="Skip duplicates", variable=self.dedupe_var, width=110)
+        self.dedupe_checkbox.pack(side="left", padx=5, pady=10)
+        self.auto_timeout_var = ctk.BooleanVar(value=self.settings.get('auto_timeout', False))
+        self.auto_timeout_checkbox = ctk.CTkCheckBox(self.options_frame, text="Auto timeout", variable=self.auto_timeout_var, width=100)
+        self.auto_timeout_checkbox.pack(side="left", padx=5, pady=10)
+        self.profile_var = ctk.BooleanVar(value=self.settings.get('profile', False))
+        self.profile_checkbox = ctk.CTkCheckBox(self.options_frame, text="Profile", variable=self.profile_var, width=70)
+        self.profile_checkbox.pack(side="left", padx=5, pady=10)
+        self.checkpoint_var = ctk.BooleanVar(value=self.settings.get('checkpoint', False))
+        self.checkpoint_checkbox = ctk.CTkCheckBox(self.options_frame, text="Checkpoint", variable=self.checkpoint_var, width=90)
+        self.checkpoint_checkbox.pack(side="left", padx=5, pady=10)
+        # Resuming is a one-off choice, so it is not saved in the settings.
+        self.resume_var = ctk.BooleanVar(value=False)
+        self.resume_checkbox = ctk.CTkCheckBox(self.options_frame, text="Resume", variable=self.resume_var, width=70)
+        self.resume_checkbox.pack(side="left", padx=5, pady=10)
+        self.metrics_var = ctk.BooleanVar(value=self.settings.get('metrics', False))
+        self.metrics_checkbox = ctk.CTkCheckBox(self.options_frame, text="Metrics", variable=self.metrics_var, width=70)
+        self.metrics_checkbox.pack(side="left", padx=5, pady=10)
+        self.case_log_var = ctk.BooleanVar(value=self.settings.get('case_log', False))
+        self.case_log_checkbox = ctk.CTkCheckBox(self.options_frame, text="Case log", variable=self.case_log_var, width=80)
+        self.case_log_checkbox.pack(side="left", padx=5, pady=10)
+
+        # Extra candidates (D, E, ...) are read from source files when a test starts.
+        # They come last in the row, so a long list of files only clips its own label.
+        self.candidate_files = list(self.settings.get('candidate_files', []))
+        self.add_candidates_button = ctk.CTkButton(self.options_frame, text="Add Candidates...", command=self.add_candidates, width=120)
+        self.add_candidates_button.pack(side="left", padx=(10, 5), pady=10)
+        self.clear_candidates_button = ctk.CTkButton(self.options_frame, text="Clear", command=self.clear_candidates, width=50)
+        self.clear_candidates_button.pack(side="left", padx=(0, 5), pady=10)
+        self.candidates_label = ctk.CTkLabel(self.options_frame, text="")
+        self.candidates_label.pack(side="left", padx=(0, 10), pady=10)
+        self.update_candidates_label()
 
         # Resize Handle
         self.resize_handle = ctk.CTkFrame(self, height=5, cursor="sb_v_double_arrow")
@@ -193,6 +284,7 @@ public class Main {
         self.result_frame = ctk.CTkFrame(self.bottom_frame)
         self.result_frame.grid_rowconfigure(1, weight=1) # Comparison row
         self.result_frame.grid_rowconfigure(3, weight=1) # Diff row
+        self.result_frame.grid_rowconfigure(5, weight=1) # Profile row
         self.result_frame.grid_columnconfigure(0, weight=1)
         self.result_frame.grid_columnconfigure(1, weight=1)
         self.result_frame.grid_columnconfigure(2, weight=1)
@@ -203,7 +295,8 @@ public class Main {
         # Labels for columns
         ctk.CTkLabel(self.result_frame, text="Input", font=bold_font).grid(row=0, column=0, sticky="ew", padx=5, pady=(2,0))
         ctk.CTkLabel(self.result_frame, text="Output B", font=bold_font).grid(row=0, column=1, sticky="ew", padx=5, pady=(2,0))
-        ctk.CTkLabel(self.result_frame, text="Output C", font=bold_font).grid(row=0, column=2, sticky="ew", padx=5, pady=(2,0))
+        self.output_c_label = ctk.CTkLabel(self.result_frame, text="Output C", font=bold_font)
+        self.output_c_label.grid(row=0, column=2, sticky="ew", padx=5, pady=(2,0))
         
         # Textboxes
         self.input_text = ctk.CTkTextbox(self.result_frame, font=font, wrap="none")
@@ -216,8 +309,12 @@ public class Main {
         ctk.CTkLabel(self.result_frame, text="Difference", font=bold_font).grid(row=2, column=0, columnspan=3, sticky="ew", padx=5, pady=(10,0))
         self.diff_text = ctk.CTkTextbox(self.result_frame, font=font, wrap="none")
         self.diff_text.grid(row=3, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
+
+        ctk.CTkLabel(self.result_frame, text="Profile", font=bold_font).grid(row=4, column=0, columnspan=3, sticky="ew", padx=5, pady=(10,0))
+        self.profile_text = ctk.CTkTextbox(self.result_frame, font=font, wrap="none")
+        self.profile_text.grid(row=5, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
         
-        for widget in [self.input_text, self.output_b_text, self.output_c_text, self.diff_text]:
+        for widget in [self.input_text, self.output_b_text, self.output_c_text, self.diff_text, self.profile_text]:
             widget.bind("<KeyPress>", self._prevent_modification)
             widget.bind("<<Paste>>", self._prevent_modification)
 
@@ -225,6 +322,10 @@ public class Main {
 
         self.log_queue = queue.Queue()
         self.tester = None
+        self.probe_thread = None
+        # Shared by every session, so the exported counters keep growing.
+        self.metrics = Metrics()
+        self.metrics_server = None
 
     def show_log_view(self):
         self.result_frame.grid_forget()
@@ -238,11 +339,14 @@ public class Main {
         self.output_b_text.delete("1.0", "end")
         self.output_c_text.delete("1.0", "end")
         self.diff_text.delete("1.0", "end")
+        self.profile_text.delete("1.0", "end")
 
         self.input_text.insert("1.0", self.discrepancy_data.get("input", ""))
         self.output_b_text.insert("1.0", self.discrepancy_data.get("output_b", ""))
         self.output_c_text.insert("1.0", self.discrepancy_data.get("output_c", ""))
         self.diff_text.insert("1.0", self.discrepancy_data.get("diff", ""))
+        self.profile_text.insert("1.0", "\n\n".join(self.discrepancy_data.get("profiles", [])))
+        self.output_c_label.configure(text=f"Output {self.discrepancy_data.get('candidate', 'C')}")
 
     def log(self, message):
         self.log_area.insert("end", message + "\n")
@@ -273,17 +377,29 @@ public class Main {
                         self.discrepancy_data["output_b"] = msg[len("_OUTPUT_B_::"):]
                     elif msg.startswith("_OUTPUT_C_::"):
                         self.discrepancy_data["output_c"] = msg[len("_OUTPUT_C_::"):]
+                    elif msg.startswith("_CANDIDATE_::"):
+                        self.discrepancy_data["candidate"] = msg[len("_CANDIDATE_::"):]
                     elif msg.startswith("_DIFF_::"):
                         self.discrepancy_data["diff"] = msg[len("_DIFF_::"):]
                 else:
                     if msg.startswith("_INPUT_::"):
                         self.last_failing_input = msg[len("_INPUT_::"):]
                         self.copy_input_button.configure(state="normal")
+                    elif msg.startswith("_PROFILE_::"):
+                        # Profiles arrive after the failure (if any) was reported.
+                        if "input" not in self.discrepancy_data and self.last_failing_input:
+                            self.discrepancy_data["input"] = self.last_failing_input
+                        self.discrepancy_data.setdefault("profiles", []).append(msg[len("_PROFILE_::"):])
+                        self.show_discrepancy_results()
                     else:
                         self.log(msg)
         except queue.Empty:
             pass
         
+        if self.probe_thread and self.probe_thread.is_alive() and not (self.tester and self.tester.running):
+            self.after(100, self.check_queue)
+            return
+
         if self.tester and self.tester.running:
             self.after(100, self.check_queue)
         else:
@@ -300,6 +416,7 @@ public class Main {
         self.show_log_view()
         self.log_area.delete("1.0", "end")
         self.last_failing_input = None
+        self.discrepancy_data = {}
         self.copy_input_button.configure(state="disabled")
 
         code_a = self.editor_a.get_code()
@@ -322,14 +439,158 @@ public class Main {
             self.log("Error: Invalid timeout value. Please enter a number.")
             return
 
-        self.tester = StressTester(code_a, lang_a, code_b, lang_b, code_c, lang_c, self.log_queue, timeout_val)
-        self.tester.start() # type: ignore
+        candidates = self.read_candidates()
+        if candidates is None:
+            return
+
+        if self.metrics_var.get() and not self.start_metrics_server():
+            return
+        if self.checkpoint_var.get() or self.resume_var.get():
+            os.makedirs(os.path.dirname(self.CHECKPOINT_FILE), exist_ok=True)
+
+        # Memoizing B also backs deduplication, which needs to know seen inputs.
+        options = {
+            'candidates': candidates,
+            'cache_size': self.REFERENCE_CACHE_SIZE if self.cache_var.get() or self.dedupe_var.get() else 0,
+            'dedupe': self.dedupe_var.get(),
+            'interpreters': {
+                'A': self.editor_a.get_interpreter(),
+                'B': self.editor_b.get_interpreter(),
+                'C': self.editor_c.get_interpreter(),
+            },
+            # With auto timeout, the entered timeout becomes the upper bound.
+            'calibrator': TimeoutCalibrator(ceiling=timeout_val) if self.auto_timeout_var.get() else None,
+            'profile_dir': self.PROFILE_DIR if self.profile_var.get() else None,
+            # A resumed session keeps checkpointing so that it can be resumed again.
+            'checkpoint': self.CHECKPOINT_FILE if self.checkpoint_var.get() or self.resume_var.get() else None,
+            'resume': self.resume_var.get(),
+            'metrics': self.metrics if self.metrics_var.get() else None,
+            'case_log': self.CASE_LOG_FILE if self.case_log_var.get() else None,
+        }
+        engine = self.engine_var.get()
+        if engine in ("async", "enumerate"):
+            try:
+                concurrency = int(self.concurrency_entry.get())
+                if concurrency <= 0:
+                    raise ValueError
+            except ValueError:
+                self.log("Error: Parallel cases must be a positive integer.")
+                return
+
+        if engine == "enumerate":
+            try:
+                total = int(self.total_entry.get())
+                if total <= 0:
+                    raise ValueError
+            except ValueError:
+                self.log("Error: Total must be a positive integer (the generator receives: index total).")
+                return
+            options.update(total=total, shards=concurrency)
+        elif engine == "async":
+            options.update(concurrency=concurrency)
+        elif engine == "distributed":
+            workers = [w.strip() for w in self.workers_entry.get().split(",") if w.strip()]
+            if not workers:
+                self.log("Error: Enter at least one worker address (host:port or unix:/path).")
+                return
+            options.update(workers=workers, token=self.token_entry.get() or None)
+        # The engine runs in its own process so that it never competes with the GUI for the GIL.
+        self.tester = ProcessStressTester(engine, code_a, lang_a, code_b, lang_b, code_c, lang_c, self.log_queue, timeout_val, **options)
+        self.tester.start()
         
         self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
         self.status_label.configure(text="Running...")
         self.after(100, self.check_queue)
 
+    def add_candidates(self):
+        """Adds source files as extra candidates; the language follows the file extension."""
+        paths = filedialog.askopenfilenames(
+            title="Extra candidates",
+            filetypes=[("Sources", " ".join(f"*{ext}" for ext in self.CANDIDATE_LANGUAGES)), ("All files", "*")],
+        )
+        for path in paths:
+            if os.path.splitext(path)[1].lower() not in self.CANDIDATE_LANGUAGES:
+                self.log(f"Error: Unknown language of {path}.")
+            elif len(self.candidate_files) >= StressTester.MAX_EXTRA_CANDIDATES:
+                self.log(f"Error: At most {StressTester.MAX_EXTRA_CANDIDATES} extra candidates are supported.")
+                break
+            elif path not in self.candidate_files:
+                self.candidate_files.append(path)
+        self.update_candidates_label()
+
+    def clear_candidates(self):
+        self.candidate_files = []
+        self.update_candidates_label()
+
+    def update_candidates_label(self):
+        names = [f"{chr(ord('D') + i)}: {os.path.basename(path)}" for i, path in enumerate(self.candidate_files)]
+        if len(names) > 3:
+            names = names[:2] + [f"... ({len(names)} files)"]
+        self.candidates_label.configure(text=", ".join(names))
+
+    def read_candidates(self):
+        """Returns the extra candidates as (code, language) pairs, or None if a file cannot be read."""
+        candidates = []
+        for path in self.candidate_files[:StressTester.MAX_EXTRA_CANDIDATES]:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    code = f.read()
+            except OSError as e:
+                self.log(f"Error: Could not read candidate {path}: {e}")
+                return None
+            candidates.append((code, self.CANDIDATE_LANGUAGES[os.path.splitext(path)[1].lower()]))
+        return candidates
+
+    def probe_interpreters(self):
+        """Times the Python solutions under every available interpreter."""
+        if self.probe_thread and self.probe_thread.is_alive():
+            return
+        solutions = [
+            (name, editor.get_code()) for name, editor in (("B", self.editor_b), ("C", self.editor_c))
+            if editor.get_language() == "python" and editor.get_code().strip()
+        ]
+        if not solutions:
+            self.log("Error: Probing needs at least one Python solution (B or C).")
+            return
+        code_a = self.editor_a.get_code()
+        lang_a = self.editor_a.get_language()
+        interpreter_a = self.editor_a.get_interpreter()
+        try:
+            timeout_val = float(self.timeout_entry.get())
+        except ValueError:
+            timeout_val = 2
+
+        def probe():
+            interpreters = available_interpreters()
+            self.log_queue.put(f"Probing interpreters: {', '.join(interpreters)}...")
+            generator = get_runner(lang_a, code_a, timeout_val, None if interpreter_a == "auto" else interpreter_a)
+            try:
+                success, msg = generator.compile()
+                if not success:
+                    self.log_queue.put(f"Compilation failed for A:\n{msg}")
+                    return
+                inputs = []
+                for i in range(self.PROBE_SAMPLES):
+                    out, err, ret = generator.run("", (str(i),))
+                    if ret != 0:
+                        self.log_queue.put(f"Generator A failed with seed {i} and is skipped:\n{err}")
+                        continue
+                    inputs.append(out)
+            finally:
+                generator.cleanup()
+            if not inputs:
+                self.log_queue.put("Error: The generator failed on every probe input.")
+                return
+            for name, code in solutions:
+                timings = probe_interpreters(code, inputs, interpreters, timeout_val)
+                self.log_queue.put(f"Interpreter probe for {name} ({len(inputs)} inputs):\n{format_probe(timings)}")
+
+        self.show_log_view()
+        self.probe_thread = threading.Thread(target=probe, daemon=True)
+        self.probe_thread.start()
+        self.after(100, self.check_queue)
+
     def stop_test(self):
         if self.tester:
             self.tester.stop()
@@ -390,7 +651,24 @@ public class Main {
                 'editor_a': self.editor_a.get_code(),
                 'editor_b': self.editor_b.get_code(),
                 'editor_c': self.editor_c.get_code(),
-            }
+            },
+            'engine': self.engine_var.get(),
+            'concurrency': self.concurrency_entry.get(),
+            'workers': self.workers_entry.get(),
+            'candidate_files': self.candidate_files,
+            'total': self.total_entry.get(),
+            'interpreters': {
+                'editor_a': self.editor_a.get_interpreter(),
+                'editor_b': self.editor_b.get_interpreter(),
+                'editor_c': self.editor_c.get_interpreter(),
+            },
+            'cache': self.cache_var.get(),
+            'dedupe': self.dedupe_var.get(),
+            'auto_timeout': self.auto_timeout_var.get(),
+            'profile': self.profile_var.get(),
+            'checkpoint': self.checkpoint_var.get(),
+            'metrics': self.metrics_var.get(),
+            'case_log': self.case_log_var.get(),
         }
         with open(self.settings_file, 'w') as f:
             json.dump(settings, f, indent=4)
@@ -410,7 +688,22 @@ public class Main {
             }
         }
 
+    def start_metrics_server(self):
+        """Starts the metrics endpoint on localhost once. Returns False if it could not be started."""
+        if self.metrics_server is not None:
+            return True
+        try:
+            self.metrics_server = MetricsServer(self.metrics, port=self.METRICS_PORT)
+        except OSError as e:
+            self.log(f"Error: Could not serve metrics on port {self.METRICS_PORT}: {e}")
+            return False
+        self.metrics_server.start()
+        self.log(f"Serving metrics at {self.metrics_server.url}")
+        return True
+
     def on_closing(self):
         """Called when the window is closed."""
         self.save_settings()
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
         self.destroy()
\ No newline at end of file
@@ -4,7 +4,10 @@ from pygments.lexers import get_lexer_by_name
 from pygments.token import Token
 
 class CodeEditor(ctk.CTkFrame):
-    def __init__(self, master, title="Code", language="python", templates=None, **kwargs):
+    # Offered in the interpreter box; any other name or path can be typed in.
+    INTERPRETERS = ["python", "python3", "pypy3", "auto"]
+
+    def __init__(self, master, title="Code", language="python", templates=None, interpreter="python", **kwargs):
         super().__init__(master, **kwargs)
         
         self.title = title
@@ -28,6 +31,15 @@ class CodeEditor(ctk.CTkFrame):
         )
         self.lang_menu.pack(side="right")
 
+        # Interpreter (Python only)
+        self.interpreter_var = ctk.StringVar(value=interpreter)
+        self.interpreter_box = ctk.CTkComboBox(
+            self.header,
+            variable=self.interpreter_var,
+            values=self.INTERPRETERS,
+            width=100
+        )
+
         # Editor Area
         self.text_area = ctk.CTkTextbox(self, font=("Consolas", 14), undo=True)
         self.text_area.pack(fill="both", expand=True, padx=5, pady=5)
@@ -99,6 +111,10 @@ class CodeEditor(ctk.CTkFrame):
 
     def _on_language_change(self, *args):
         lang = self.lang_var.get()
+        if lang == "python":
+            self.interpreter_box.pack(side="right", padx=(0, 5))
+        else:
+            self.interpreter_box.pack_forget()
         try:
             self.lexer = get_lexer_by_name(lang)
         except Exception:
@@ -129,3 +145,6 @@ class CodeEditor(ctk.CTkFrame):
     
     def get_language(self):
         return self.lang_var.get()
+
+    def get_interpreter(self):
+        return self.interpreter_var.get().strip() or "python"